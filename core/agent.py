@@ -0,0 +1,299 @@
+# core/agent.py
+
+import asyncio
+import hmac
+import ipaddress
+import json
+import platform
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+
+def collect_snapshot() -> dict:
+    """Host facts plus the process table ({pid: name}) of this machine."""
+    import psutil  # install via: pip install psutil
+
+    memory = psutil.virtual_memory()
+    processes = {}
+    for proc in psutil.process_iter(attrs=["pid", "name"]):
+        processes[str(proc.info["pid"])] = proc.info["name"] or ""
+    return {
+        "info": {
+            "Host": socket.gethostname(),
+            "OS": f"{platform.system()} {platform.release()}",
+            "CPU Cores": psutil.cpu_count(),
+            "CPU %": psutil.cpu_percent(interval=None),
+            "Memory": f"{memory.total // (1024 ** 2)} MB",
+            "Memory %": memory.percent,
+            "Uptime s": int(time.time() - psutil.boot_time()),
+        },
+        "processes": processes,
+    }
+
+
+def diff_snapshot(previous: Optional[dict], current: dict) -> dict:
+    """Delta from ``previous`` to ``current``; a full snapshot when there is no base."""
+    if previous is None:
+        return {"full": True, "info": current["info"], "added": current["processes"], "removed": []}
+    old_info, old_procs = previous["info"], previous["processes"]
+    new_procs = current["processes"]
+    return {
+        "full": False,
+        "info": {k: v for k, v in current["info"].items() if old_info.get(k) != v},
+        "added": {pid: name for pid, name in new_procs.items() if old_procs.get(pid) != name},
+        "removed": [pid for pid in old_procs if pid not in new_procs],
+    }
+
+
+def apply_delta(state: Optional[dict], delta: dict) -> dict:
+    """Inverse of ``diff_snapshot``: rebuild the agent's snapshot on the collector side."""
+    if delta["full"] or state is None:
+        state = {"info": {}, "processes": {}}
+    state["info"].update(delta["info"])
+    state["processes"].update(delta["added"])
+    for pid in delta["removed"]:
+        state["processes"].pop(pid, None)
+    return state
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class AgentServer:
+    """
+    Lightweight agent exposing this host's system info and processes.
+
+    Speaks the same line-delimited JSON as the gateway server. Each request
+    ``{"id": 1, "op": "snapshot"}`` is answered with a delta against what was
+    last sent on that connection (the first answer is a full snapshot), so
+    steady-state polls carry only changed fields and started/exited
+    processes. Probes are cached for ``min_interval`` seconds so many
+    collectors polling at once cost one scan. If ``token`` is set, requests
+    must carry it; without a token the agent only binds to loopback
+    addresses or a Unix socket.
+    """
+
+    def __init__(self, token: Optional[str] = None, min_interval: float = 1.0):
+        self.token = token
+        self.min_interval = min_interval
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._cached: Optional[dict] = None
+        self._cached_at = 0.0
+        self._probe: Optional[asyncio.Future] = None
+
+    async def _snapshot(self) -> dict:
+        if self._cached is not None and time.monotonic() - self._cached_at < self.min_interval:
+            return self._cached
+        if self._probe is None:
+            # concurrent requests share a single in-flight probe
+            loop = asyncio.get_running_loop()
+            self._probe = loop.run_in_executor(self.executor, collect_snapshot)
+        probe = self._probe
+        try:
+            snapshot = await asyncio.shield(probe)
+        finally:
+            if self._probe is probe and probe.done():
+                self._probe = None
+        self._cached, self._cached_at = snapshot, time.monotonic()
+        return snapshot
+
+    async def _handle_client(self, reader, writer) -> None:
+        last_sent = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                request = None
+                try:
+                    request = json.loads(line)
+                    if self.token and not hmac.compare_digest(str(request.get("token", "")), self.token):
+                        response = {"ok": False, "error": "Not authenticated."}
+                    elif request.get("op") == "snapshot":
+                        if request.get("full"):
+                            last_sent = None
+                        snapshot = await self._snapshot()
+                        response = {"ok": True, **diff_snapshot(last_sent, snapshot)}
+                        last_sent = snapshot
+                    else:
+                        response = {"ok": False, "error": f"Unknown op '{request.get('op')}'."}
+                except (ValueError, AttributeError) as exc:
+                    response = {"ok": False, "error": f"Bad request: {exc}"}
+                except Exception as exc:
+                    response = {"ok": False, "error": str(exc)}
+                response["id"] = request.get("id") if isinstance(request, dict) else None
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def check_bind(self, host: str, unix_socket: Optional[str] = None) -> None:
+        """Raise ValueError when serving on ``host`` would expose the agent without a token."""
+        if not self.token and not unix_socket and not _is_loopback(host):
+            raise ValueError(f"Refusing to serve on {host} without a token; "
+                             "set --agent-token (or $AGENT_TOKEN) or bind to 127.0.0.1.")
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8766,
+                            unix_socket: Optional[str] = None) -> None:
+        self.check_bind(host, unix_socket)
+        if unix_socket:
+            server = await asyncio.start_unix_server(self._handle_client, path=unix_socket,
+                                                     limit=2 ** 24)
+        else:
+            server = await asyncio.start_server(self._handle_client, host, port, limit=2 ** 24)
+        async with server:
+            await server.serve_forever()
+
+    def run(self, host: str = "127.0.0.1", port: int = 8766,
+            unix_socket: Optional[str] = None) -> None:
+        try:
+            asyncio.run(self.serve_forever(host, port, unix_socket))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=False)
+
+
+class _AgentLink:
+    """Collector-side state for one agent: connection, rebuilt snapshot, health."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.reader = None
+        self.writer = None
+        self.state: Optional[dict] = None
+        self.status = "connecting"
+        self.error = ""
+        self.latency_ms: Optional[float] = None
+        self.last_seen: Optional[float] = None
+        self.delta_bytes = 0
+
+    async def connect(self, timeout: float) -> None:
+        if self.address.startswith("unix:"):
+            opening = asyncio.open_unix_connection(self.address[5:], limit=2 ** 24)
+        else:
+            host, _, port = self.address.rpartition(":")
+            opening = asyncio.open_connection(host or "127.0.0.1", int(port), limit=2 ** 24)
+        self.reader, self.writer = await asyncio.wait_for(opening, timeout)
+        # a fresh connection always starts from a full snapshot
+        self.state = None
+
+    def drop(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class FleetCollector:
+    """
+    Polls many agents concurrently from one asyncio loop on a background thread.
+
+    Every round sends one snapshot request per agent and waits for all of
+    them together, each bounded by ``timeout``, so a slow or dead host only
+    marks its own row stale instead of stalling the others. ``rows()`` may be
+    called from any thread (e.g. a Tk ``after`` callback).
+    """
+
+    def __init__(self, addresses: List[str], interval: float = 2.0, timeout: float = 1.5,
+                 token: Optional[str] = None):
+        self.interval = interval
+        self.timeout = timeout
+        self.token = token
+        self._links: Dict[str, _AgentLink] = {a: _AgentLink(a) for a in addresses}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    async def _poll_agent(self, link: _AgentLink) -> None:
+        start = time.perf_counter()
+        try:
+            if link.writer is None:
+                await link.connect(self.timeout)
+            request = {"op": "snapshot", "full": link.state is None}
+            if self.token:
+                request["token"] = self.token
+            link.writer.write(json.dumps(request).encode() + b"\n")
+            await link.writer.drain()
+            line = await asyncio.wait_for(link.reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionError("agent closed the connection")
+            response = json.loads(line)
+            if not response.get("ok"):
+                raise RuntimeError(response.get("error", "agent error"))
+        except Exception as exc:
+            link.drop()
+            with self._lock:
+                link.status, link.error = "down", str(exc) or type(exc).__name__
+            return
+        with self._lock:
+            link.state = apply_delta(link.state, response)
+            link.status, link.error = "up", ""
+            link.latency_ms = (time.perf_counter() - start) * 1000
+            link.last_seen = time.time()
+            link.delta_bytes = len(line)
+
+    async def poll_once(self) -> None:
+        await asyncio.gather(*(self._poll_agent(link) for link in self._links.values()))
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            started = time.monotonic()
+            await self.poll_once()
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        for link in self._links.values():
+            link.drop()
+
+    def start(self) -> None:
+        def target():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._run())
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    def rows(self) -> List[dict]:
+        """One summary dict per agent, in configuration order."""
+        with self._lock:
+            rows = []
+            for link in self._links.values():
+                info = (link.state or {}).get("info", {})
+                rows.append({
+                    "agent": link.address,
+                    "status": link.status,
+                    "host": info.get("Host", ""),
+                    "os": info.get("OS", ""),
+                    "cpu": info.get("CPU %", ""),
+                    "memory": info.get("Memory %", ""),
+                    "processes": len((link.state or {}).get("processes", {})) if link.state else "",
+                    "latency_ms": round(link.latency_ms, 1) if link.latency_ms is not None else "",
+                    "delta_bytes": link.delta_bytes or "",
+                    "last_seen": time.strftime("%H:%M:%S", time.localtime(link.last_seen))
+                    if link.last_seen else "",
+                    "error": link.error,
+                })
+            return rows
+
+    def processes(self, address: str) -> Dict[str, str]:
+        with self._lock:
+            link = self._links.get(address)
+            return dict((link.state or {}).get("processes", {})) if link else {}
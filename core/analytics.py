@@ -0,0 +1,278 @@
+# core/analytics.py
+"""
+Column-oriented audit analytics.
+
+    python -m core.analytics                       # summary of logs/actions.db
+    python -m core.analytics --window 300 --top 20
+
+Events are loaded straight from the dictionary-encoded ``audit_event``
+table into NumPy arrays (ids, never strings) in chunks, and every
+statistic is computed with vectorized operations over those columns.
+"""
+
+import argparse
+import itertools
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List
+
+# statuses that count as a failed attempt
+FAILURE_STATUSES = ("failed", "denied", "throttled")
+COLUMNS = ("ts", "user_id", "action_id", "status_id")
+# bit widths used to pack one row into a single 64-bit integer inside SQLite
+PACKED_BITS = (("ts", 34), ("user_id", 16), ("action_id", 8), ("status_id", 4))
+
+
+def _numpy():
+    try:
+        import numpy  # install via: pip install numpy
+    except ImportError as exc:
+        raise RuntimeError("Audit analytics needs NumPy (pip install numpy).") from exc
+    return numpy
+
+
+def _packing_fits(conn: sqlite3.Connection) -> bool:
+    limits = conn.execute(
+        "SELECT max(ts), (SELECT max(id) FROM audit_user), (SELECT max(id) FROM audit_action),"
+        " (SELECT max(id) FROM audit_status) FROM audit_event").fetchone()
+    return all((value or 0) < (1 << bits) for value, (_, bits) in zip(limits, PACKED_BITS))
+
+
+def iter_chunks(db_path: str, after_id: int = 0, until_id: int = None,
+                chunk_rows: int = 1_000_000) -> Iterator[dict]:
+    """
+    Yield ``{column: ndarray}`` chunks of audit_event rows in (after_id, until_id].
+
+    Building Python row objects dominates the load, so when the ids fit, each
+    row is packed into one integer by SQLite and unpacked with NumPy shifts.
+    """
+    np = _numpy()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        until_id = until_id if until_id is not None else (
+            conn.execute("SELECT max(id) FROM audit_event").fetchone()[0] or 0)
+        packed = _packing_fits(conn)
+        if packed:
+            expr = "ts"
+            for name, bits in PACKED_BITS[1:]:
+                expr = f"(({expr}) << {bits}) | {name}"
+            select, width = expr, 1
+        else:
+            select, width = ", ".join(COLUMNS), len(COLUMNS)
+
+        cursor = conn.execute(
+            f"SELECT {select} FROM audit_event WHERE id > ? AND id <= ? ORDER BY id",
+            (after_id, until_id))
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            # flatten row tuples straight into one int64 buffer, no per-row lists
+            flat = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int64,
+                               count=len(rows) * width)
+            if packed:
+                chunk = {}
+                for name, bits in reversed(PACKED_BITS[1:]):
+                    chunk[name] = flat & ((1 << bits) - 1)
+                    flat = flat >> bits
+                chunk["ts"] = flat
+                yield chunk
+            else:
+                block = flat.reshape(len(rows), width)
+                yield {name: block[:, i].copy() for i, name in enumerate(COLUMNS)}
+    finally:
+        conn.close()
+
+
+def coalesced_events(db_path: str, after_id: int, until_id: int):
+    """
+    Extra events hidden in coalesced rows (``count`` repeats from first_ts to ts).
+
+    Each such row is already loaded once as itself; the remaining count-1
+    events are spread evenly over its span so totals, rates and windows see
+    every call. Returns a column chunk, or None when there is nothing to add.
+    """
+    np = _numpy()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(COLUMNS)}, count, first_ts FROM audit_event "
+            "WHERE count IS NOT NULL AND id > ? AND id <= ? AND count > 1",
+            (after_id, until_id)).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return None
+    block = np.array(rows, dtype=np.int64)
+    extra = block[:, 4] - 1
+    chunk = {name: np.repeat(block[:, i], extra) for i, name in enumerate(COLUMNS)}
+    # k-th extra event of a row sits at first_ts + k * span / count
+    offsets = np.arange(int(extra.sum())) - np.repeat(np.cumsum(extra) - extra, extra)
+    first, span = np.repeat(block[:, 5], extra), np.repeat(block[:, 0] - block[:, 5], extra)
+    chunk["ts"] = first + offsets * span // np.repeat(block[:, 4], extra)
+    return chunk
+
+
+class AuditAnalytics:
+    """
+    Incrementally loaded audit columns plus vectorized summaries.
+
+    ``refresh`` appends only rows added since the previous load, so
+    re-running the analysis from the Logs tab costs the new rows only.
+    Coalesced rows are expanded back into their individual events.
+    """
+
+    def __init__(self, db_path: str, chunk_rows: int = 1_000_000):
+        self.db_path = db_path
+        self.chunk_rows = chunk_rows
+        self.columns: Dict[str, "object"] = {}
+        self.names: Dict[str, Dict[int, str]] = {}
+        self.last_id = 0
+
+    def refresh(self) -> int:
+        """Load new rows and lookup names; returns the number of rows added."""
+        np = _numpy()
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            until_id = conn.execute("SELECT max(id) FROM audit_event").fetchone()[0] or 0
+            for kind in ("user", "action", "status"):
+                self.names[kind] = dict(conn.execute(f"SELECT id, name FROM audit_{kind}").fetchall())
+        finally:
+            conn.close()
+
+        chunks = list(iter_chunks(self.db_path, self.last_id, until_id, self.chunk_rows))
+        expanded = coalesced_events(self.db_path, self.last_id, until_id)
+        if expanded is not None:
+            chunks.append(expanded)
+        if chunks:
+            for name in COLUMNS:
+                parts = ([self.columns[name]] if name in self.columns else []) + [c[name] for c in chunks]
+                self.columns[name] = np.concatenate(parts)
+        self.last_id = max(self.last_id, until_id)
+        return sum(len(c["ts"]) for c in chunks)
+
+    def __len__(self):
+        return len(self.columns.get("ts", ()))
+
+    def _failure_mask(self):
+        np = _numpy()
+        failure_ids = [i for i, name in self.names["status"].items() if name in FAILURE_STATUSES]
+        return np.isin(self.columns["status_id"], failure_ids)
+
+    def user_summary(self, window: int = 60) -> List[dict]:
+        """Per-user totals, failure ratio, average rate and busiest window."""
+        if not len(self):
+            return []
+        np = _numpy()
+        users, ts = self.columns["user_id"], self.columns["ts"]
+        size = int(users.max()) + 1
+
+        totals = np.bincount(users, minlength=size)
+        failures = np.bincount(users, weights=self._failure_mask(), minlength=size)
+        first = np.full(size, np.iinfo(np.int64).max)
+        last = np.full(size, np.iinfo(np.int64).min)
+        np.minimum.at(first, users, ts)
+        np.maximum.at(last, users, ts)
+
+        # busiest window per user: count (user, window) pairs, then max per user
+        stride = int(ts.max() // window) + 1
+        pair_keys, pair_counts = np.unique(users * stride + ts // window, return_counts=True)
+        peak = np.zeros(size, dtype=np.int64)
+        np.maximum.at(peak, pair_keys // stride, pair_counts)
+
+        summary = []
+        for uid in np.nonzero(totals)[0]:
+            span_min = max(1.0, (last[uid] - first[uid]) / 60)
+            summary.append({
+                "user": self.names["user"].get(int(uid), str(uid)),
+                "total": int(totals[uid]),
+                "failures": int(failures[uid]),
+                "failure_ratio": round(float(failures[uid] / totals[uid]), 4),
+                "rate_per_min": round(float(totals[uid] / span_min), 3),
+                "peak_window": int(peak[uid]),
+            })
+        summary.sort(key=lambda row: row["total"], reverse=True)
+        return summary
+
+    def anomalies(self, window: int = 60, z_threshold: float = 6.0, min_count: int = 10,
+                  top: int = 50) -> List[dict]:
+        """
+        Windows where a (user, action) series spikes far above its own average.
+
+        Each series' expected per-window count is its total spread over all
+        windows that saw any activity; a window is flagged when its count is at least
+        ``min_count`` and its Poisson z-score exceeds ``z_threshold``. Failed
+        attempts are scored separately ("failure_spike") from all calls
+        ("burst"), so a flood of denied ``read_file`` stands out even when the
+        user's overall volume looks normal.
+        """
+        if not len(self):
+            return []
+        np = _numpy()
+        ts = self.columns["ts"]
+        t0 = int(ts.min())
+        windows = (ts - t0) // window
+        n_windows = int(windows.max()) + 1
+        # baseline over windows with any activity at all, so idle periods
+        # (gateway stopped overnight) do not make normal traffic look bursty
+        active_windows = len(np.unique(windows))
+        n_actions = int(self.columns["action_id"].max()) + 1
+        series = self.columns["user_id"] * n_actions + self.columns["action_id"]
+
+        found = []
+        for kind, mask in (("failure_spike", self._failure_mask()), ("burst", None)):
+            s = series if mask is None else series[mask]
+            w = windows if mask is None else windows[mask]
+            if not len(s):
+                continue
+            keys, counts = np.unique(s * n_windows + w, return_counts=True)
+            key_series = keys // n_windows
+            _, inverse = np.unique(key_series, return_inverse=True)
+            expected = np.bincount(inverse, weights=counts) / active_windows
+            lam = expected[inverse]
+            score = (counts - lam) / np.sqrt(np.maximum(lam, 1e-9))
+            flagged = np.nonzero((counts >= min_count) & (score > z_threshold))[0]
+            for i in flagged:
+                uid, aid = divmod(int(key_series[i]), n_actions)
+                start = t0 + int(keys[i] % n_windows) * window
+                found.append({
+                    "kind": kind,
+                    "user": self.names["user"].get(uid, str(uid)),
+                    "action": self.names["action"].get(aid, str(aid)),
+                    "window_start": datetime.fromtimestamp(start, timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                    "count": int(counts[i]),
+                    "expected": round(float(lam[i]), 3),
+                    "score": round(float(score[i]), 1),
+                })
+        found.sort(key=lambda row: row["score"], reverse=True)
+        return found[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize the audit log and flag anomalies")
+    parser.add_argument("--db", default="logs/actions.db", help="audit database path")
+    parser.add_argument("--window", type=int, default=60, help="burst window in seconds")
+    parser.add_argument("--z", type=float, default=6.0, help="anomaly z-score threshold")
+    parser.add_argument("--top", type=int, default=50, help="maximum anomalies to report")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    analytics = AuditAnalytics(args.db)
+    analytics.refresh()
+    loaded = time.perf_counter()
+    report = {
+        "rows": len(analytics),
+        "users": analytics.user_summary(args.window),
+        "anomalies": analytics.anomalies(args.window, args.z, top=args.top),
+    }
+    report["load_s"] = round(loaded - start, 3)
+    report["analyze_s"] = round(time.perf_counter() - loaded, 3)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
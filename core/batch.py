@@ -0,0 +1,144 @@
+# core/batch.py
+
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import IO, Iterator
+
+from core.gateway import Gateway, audit_args, result_size
+from core.logger import TIMESTAMP_FORMAT
+
+
+class BatchRunner:
+    """
+    Stream JSONL requests through the Gateway's RBAC path on a worker pool.
+
+    Each input line looks like ``{"user": "admin", "action": "read_file",
+    "args": {"path": "..."}}``. Results are written as JSONL in input order
+    while later requests are still running, and audit rows are flushed in
+    bulk transactions of ``audit_batch_size`` entries, each stamped with the
+    time its request finished.
+    """
+
+    def __init__(self, gateway: Gateway, parallelism: int = 8, audit_batch_size: int = 500):
+        self.gateway = gateway
+        self.parallelism = max(1, parallelism)
+        self.audit_batch_size = audit_batch_size
+        self._sessions = {}
+        self._pending_audit = []
+
+    def _session(self, username):
+        if username not in self._sessions:
+            self._sessions[username] = self.gateway.security_controller.session_for(username)
+        return self._sessions[username]
+
+    def _execute(self, line_no: int, request: dict, submitted: float) -> dict:
+        queue_wait_ms = (time.perf_counter() - submitted) * 1000
+        username = request.get("user", "")
+        action = request.get("action", "")
+        session = self._session(username)
+
+        if session is None:
+            status, success, result, duration_ms = "denied", False, f"Unknown user '{username}'.", None
+        else:
+            try:
+                status, success, result, duration_ms = self.gateway.run(
+                    session, action, request.get("args"), queue_wait_ms=queue_wait_ms)
+            except Exception as exc:
+                status, success, result, duration_ms = "failed", False, str(exc), None
+
+        return {
+            "line": line_no,
+            "id": request.get("id"),
+            "user": username,
+            "action": action,
+            "status": status,
+            "ok": success,
+            "result": result,
+            "duration_ms": duration_ms,
+            "args": request.get("args"),
+        }
+
+    def _read_requests(self, source: IO) -> Iterator[tuple]:
+        for line_no, line in enumerate(source, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                if not isinstance(request.get("user", ""), str):
+                    raise ValueError("user must be a string")
+                if not isinstance(request.get("action", ""), str):
+                    raise ValueError("action must be a string")
+                if not isinstance(request.get("args"), (dict, type(None))):
+                    raise ValueError("args must be a JSON object or null")
+            except ValueError as exc:
+                yield line_no, None, str(exc)
+                continue
+            yield line_no, request, None
+
+    def _audit(self, result: dict) -> None:
+        self._pending_audit.append((
+            result["user"], result["action"], result["status"], result["duration_ms"],
+            audit_args(result.pop("args", None)), result_size(result["result"]),
+            datetime.now().strftime(TIMESTAMP_FORMAT),
+        ))
+        if len(self._pending_audit) >= self.audit_batch_size:
+            self._flush_audit()
+
+    def _flush_audit(self) -> None:
+        if self._pending_audit:
+            self.gateway.audit_logger.record_many(self._pending_audit)
+            self._pending_audit = []
+
+    def run(self, source: IO, sink: IO) -> dict:
+        """Process every request in ``source``; returns summary counters."""
+        summary = {"total": 0, "success": 0, "failed": 0, "denied": 0, "throttled": 0, "invalid": 0}
+        window = deque()
+
+        def emit(result):
+            if result["status"] != "invalid":
+                self._audit(result)
+            sink.write(json.dumps(result) + "\n")
+            summary["total"] += 1
+            summary[result["status"]] += 1
+
+        # the sessions cache is filled on the reader thread so workers never race on it
+        with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+            try:
+                for line_no, request, error in self._read_requests(source):
+                    if request is None:
+                        future = Future()
+                        future.set_result({"line": line_no, "status": "invalid",
+                                           "ok": False, "result": error})
+                    else:
+                        self._session(request.get("user", ""))
+                        future = pool.submit(self._execute, line_no, request, time.perf_counter())
+                    window.append(future)
+
+                    # bounded in-flight window keeps memory flat for huge inputs
+                    while len(window) >= self.parallelism * 4:
+                        emit(window.popleft().result())
+
+                while window:
+                    emit(window.popleft().result())
+            finally:
+                self._flush_audit()
+                sink.flush()
+
+        return summary
+
+
+def run_batch(gateway: Gateway, input_path: str, output_path: str = None,
+              parallelism: int = 8) -> dict:
+    runner = BatchRunner(gateway, parallelism=parallelism)
+    with open(input_path, "r", encoding="utf-8") as source:
+        if output_path:
+            with open(output_path, "w", encoding="utf-8") as sink:
+                return runner.run(source, sink)
+        return runner.run(source, sys.stdout)
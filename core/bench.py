@@ -0,0 +1,196 @@
+# core/bench.py
+"""
+Benchmark suite for the audit, policy and syscall hot paths.
+
+    python -m core.bench                          # run, print JSON
+    python -m core.bench --save baseline.json     # run and save results
+    python -m core.bench --compare baseline.json  # fail on regressions
+
+Each benchmark works in a temporary directory so the real audit database
+is never touched.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from core.logger import AuditLogger
+from core.policy import PolicyManager
+from core.security import SecurityController
+from core.syscalls import SyscallEngine
+from core.userstore import SqliteUserStore
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pct(p):
+        return ordered[min(n - 1, int(p * n))]
+
+    return {
+        "p50_us": pct(0.50) * 1e6,
+        "p95_us": pct(0.95) * 1e6,
+        "p99_us": pct(0.99) * 1e6,
+        "mean_us": statistics.fmean(ordered) * 1e6,
+    }
+
+
+def _time_calls(func, iterations):
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    result = _percentiles(samples)
+    result["ops_per_sec"] = iterations / total if total else 0.0
+    result["iterations"] = iterations
+    return result
+
+
+def _seed_audit_rows(db_path, rows):
+    """Fill the audit log with synthetic rows through the bulk writer."""
+    logger = AuditLogger(db_path)
+    users = ["admin", "user", "guest", "ops", "svc"]
+    actions = ["read_file", "write_file", "list_processes", "ping_host", "system_info"]
+    statuses = ["success", "failed", "denied"]
+    batch = 50_000
+    for start in range(0, rows, batch):
+        logger.record_many(
+            (users[i % 5], actions[i % 5 if i % 7 else 0], statuses[i % 3], 1.0,
+             {"path": f"/var/log/app{i % 50}.log"}, 4096)
+            for i in range(start, min(rows, start + batch))
+        )
+
+
+def bench_audit_record(workdir, iterations):
+    logger = AuditLogger(os.path.join(workdir, "record.db"))
+    return _time_calls(lambda: logger.record("admin", "read_file", "success"), iterations)
+
+
+def bench_audit_queries(workdir, row_counts):
+    results = {}
+    for rows in row_counts:
+        db_path = os.path.join(workdir, f"query_{rows}.db")
+        _seed_audit_rows(db_path, rows)
+        logger = AuditLogger(db_path)
+        csv_path = os.path.join(workdir, "export.csv")
+        results[str(rows)] = {
+            "fetch_logs": _time_calls(lambda: logger.fetch_logs(limit=2000), 20),
+            "fetch_logs_filtered": _time_calls(
+                lambda: logger.fetch_logs(limit=2000, filters={"username": "ops", "status": "failed"}), 20),
+            "export_csv": _time_calls(lambda: logger.export_csv(csv_path, limit=5000), 5),
+        }
+        os.remove(db_path)
+    return results
+
+
+def bench_auth(workdir, iterations, policy_path):
+    policy = PolicyManager(policy_path)
+    store = SqliteUserStore(os.path.join(workdir, "users.db"))
+    store.add_users((f"user{i}", "secret", "standard_user") for i in range(200))
+    controller = SecurityController(None, policy, user_store=store)
+    session = controller.session_for("user7")
+    return {
+        # PBKDF2 is deliberately slow; keep the iteration count small
+        "authenticate": _time_calls(lambda: controller.authenticate("user7", "secret"), max(5, iterations // 200)),
+        "session_lookup": _time_calls(lambda: controller.session_for("user7"), iterations),
+        "permission_check": _time_calls(lambda: "read_file" in session["permissions"], iterations),
+    }
+
+
+def bench_syscalls(workdir, iterations, file_mb):
+    big_file = os.path.join(workdir, "big.txt")
+    line = "x" * 99 + "\n"
+    with open(big_file, "w") as fh:
+        for _ in range(file_mb * 1024 * 1024 // len(line)):
+            fh.write(line)
+    return {
+        "list_processes": _time_calls(SyscallEngine.list_processes, max(3, iterations // 100)),
+        f"read_file_{file_mb}mb": _time_calls(lambda: SyscallEngine.read_file(big_file), 5),
+    }
+
+
+def run_suite(quick=False, policy_path="data/policy.json"):
+    iterations = 200 if quick else 2000
+    row_counts = [10_000, 100_000] if quick else [10_000, 1_000_000, 10_000_000]
+    file_mb = 8 if quick else 64
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+        results = {
+            "audit_record": bench_audit_record(workdir, iterations),
+            "audit_queries": bench_audit_queries(workdir, row_counts),
+            "auth": bench_auth(workdir, iterations, policy_path),
+            "syscalls": bench_syscalls(workdir, iterations, file_mb),
+        }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def _flatten(results, prefix=""):
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and "p50_us" in value:
+            yield name, value
+        elif isinstance(value, dict):
+            yield from _flatten(value, name + ".")
+
+
+def compare(current, baseline, tolerance=0.25):
+    """Return a list of (name, baseline_p50, current_p50) that regressed beyond tolerance."""
+    base = dict(_flatten(baseline["results"]))
+    regressions = []
+    for name, stats in _flatten(current["results"]):
+        if name not in base:
+            continue
+        before, after = base[name]["p50_us"], stats["p50_us"]
+        if before and after > before * (1 + tolerance):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the gateway hot paths")
+    parser.add_argument("--quick", action="store_true", help="smaller datasets for a fast run")
+    parser.add_argument("--save", metavar="JSON", help="write results to this file")
+    parser.add_argument("--compare", metavar="JSON", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p50 slowdown before a regression is reported (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    report = run_suite(quick=args.quick)
+    print(json.dumps(report, indent=2))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: p50 {before:.1f}us -> {after:.1f}us", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regressions against baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# core/coalesce.py
+
+import atexit
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from core.logger import TIMESTAMP_FORMAT, encode_args
+
+# never merged: state-changing or authentication events keep one row per call
+DEFAULT_EXEMPT = ("login", "write_file", "spawn_process")
+
+
+class CoalescingAuditLogger:
+    """
+    Coalescing stage in front of an AuditLogger (or SpoolingAuditLogger).
+
+    The first event of a (user, action, status, args) key is written at once.
+    Identical events arriving within ``window_seconds`` of it are only
+    counted; when the window closes they are written as one row carrying
+    ``count``, the first/last timestamps and the summed duration and result
+    size, so totals stay exact while a polling UI produces two rows per
+    window instead of one per refresh. Actions in ``exempt`` are passed
+    through unchanged; ``actions`` maps an action to its own window (0
+    exempts it). Everything else (fetch_logs, verify, ...) is delegated to
+    the wrapped logger.
+    """
+
+    def __init__(self, audit_logger, window_seconds: float = 10.0,
+                 exempt: Iterable[str] = DEFAULT_EXEMPT,
+                 actions: Optional[Dict[str, float]] = None):
+        self.audit_logger = audit_logger
+        self.window_seconds = window_seconds
+        self.exempt = frozenset(exempt)
+        self.actions = dict(actions or {})
+        self._lock = threading.Lock()
+        # key -> [window_end, count, first_timestamp, last_timestamp, duration_ms, result_size]
+        self._open: Dict[tuple, list] = {}
+        self._stop = threading.Event()
+        self._flusher = None
+        self.coalesced = 0
+
+    @classmethod
+    def from_policy(cls, audit_logger, policy_manager):
+        """Wrap ``audit_logger`` per the policy's "audit_coalescing" section, if present and enabled."""
+        rules = policy_manager.get_coalescing()
+        if not rules or not rules.get("enabled", True):
+            return audit_logger
+        return cls(audit_logger,
+                   window_seconds=rules.get("window_seconds", 10.0),
+                   exempt=rules.get("exempt", DEFAULT_EXEMPT),
+                   actions=rules.get("actions"))
+
+    def __getattr__(self, name):
+        return getattr(self.audit_logger, name)
+
+    def _window(self, action: str) -> float:
+        if action in self.exempt:
+            return 0.0
+        return self.actions.get(action, self.window_seconds)
+
+    def record(self, username: str, action: str, status: str,
+               duration_ms: Optional[float] = None, args: Optional[dict] = None,
+               result_size: Optional[int] = None) -> None:
+        window = self._window(action)
+        if window <= 0:
+            self.audit_logger.record(username, action, status, duration_ms, args, result_size)
+            return
+
+        key = (username, action, status, encode_args(args))
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        expired = []
+        with self._lock:
+            first = self._fold(key, window, time.monotonic(), timestamp, duration_ms, result_size, expired)
+        if not first:
+            return
+        self._write(expired)
+        self.audit_logger.record(username, action, status, duration_ms, args, result_size)
+        self._ensure_flusher()
+
+    def record_many(self, entries: Iterable[tuple]) -> int:
+        """
+        Coalesce a batch; first-seen and exempt events go to the wrapped
+        logger's ``record_many`` in one call (one transaction).
+        """
+        now = time.monotonic()
+        stamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        first_seen, expired, count = [], [], 0
+        with self._lock:
+            for entry in entries:
+                count += 1
+                entry = tuple(entry) + (None,) * (7 - len(entry))
+                username, action, status, duration_ms, args, result_size, timestamp = entry[:7]
+                window = self._window(action)
+                if window <= 0 or self._fold((username, action, status, encode_args(args)), window, now,
+                                             timestamp or stamp, duration_ms, result_size, expired):
+                    first_seen.append(entry)
+        self._write(expired)
+        if first_seen:
+            self.audit_logger.record_many(first_seen)
+            self._ensure_flusher()
+        return count
+
+    def _fold(self, key: tuple, window: float, now: float, timestamp: str,
+              duration_ms: Optional[float], result_size: Optional[int], expired: list) -> bool:
+        """
+        Count a repeat into its open window, or open a new one (closing an
+        expired window into ``expired``). Caller holds the lock.
+
+        :return: True if the event is the first of its window and must be written
+        """
+        entry = self._open.get(key)
+        if entry is not None and now >= entry[0]:
+            expired.append((key, self._open.pop(key)))
+            entry = None
+        if entry is None:
+            self._open[key] = [now + window, 0, None, None, None, None]
+            return True
+        entry[1] += 1
+        entry[2] = entry[2] or timestamp
+        entry[3] = timestamp
+        if duration_ms is not None:
+            entry[4] = (entry[4] or 0.0) + duration_ms
+        if result_size is not None:
+            entry[5] = (entry[5] or 0) + result_size
+        self.coalesced += 1
+        return False
+
+    def _write(self, closed) -> None:
+        rows = []
+        for (username, action, status, args_json), entry in closed:
+            _, count, first_timestamp, last_timestamp, duration_ms, result_size = entry
+            if count:
+                rows.append((username, action, status, last_timestamp, duration_ms,
+                             args_json, result_size, count, first_timestamp))
+        if rows:
+            self.audit_logger._append(rows)
+
+    def flush(self, force: bool = True) -> int:
+        """Write closed windows (every open window when ``force``); returns rows written."""
+        now = time.monotonic()
+        with self._lock:
+            closed = [(key, entry) for key, entry in self._open.items() if force or now >= entry[0]]
+            for key, _ in closed:
+                del self._open[key]
+        self._write(closed)
+        return sum(1 for _, entry in closed if entry[1])
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            interval = min([self.window_seconds] + [w for w in self.actions.values() if w > 0])
+            self._flusher = threading.Thread(target=self._run, args=(max(interval / 2, 0.1),),
+                                             daemon=True)
+            self._flusher.start()
+            # pending counts are written on a clean exit even if close() is never called
+            atexit.register(self.flush)
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush(force=False)
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+        if hasattr(self.audit_logger, "close"):
+            self.audit_logger.close()
@@ -0,0 +1,255 @@
+# core/constraints.py
+
+import bisect
+import fnmatch
+import ipaddress
+import os
+import re
+import socket
+from typing import Dict, List, Optional
+
+from core.hashing import split_paths
+
+# argument name -> kind of matcher compiled for it
+ARGUMENT_KINDS = {"path": "path", "paths": "path", "host": "host", "command": "command"}
+_GLOB_CHARS = set("*?[")
+_HOST_LABEL = re.compile(r"(?!-)[a-z0-9-]{1,63}(?<!-)\Z")
+
+
+def is_valid_host(host: str) -> bool:
+    """True for an IP literal or a syntactically valid DNS host name (nothing a shell could parse)."""
+    if _is_address(host):
+        return True
+    name = host.lower()
+    name = name[:-1] if name.endswith(".") else name
+    return 0 < len(name) <= 253 and all(_HOST_LABEL.match(label) for label in name.split("."))
+
+
+def _combined_regex(globs: List[str], flags: int = 0):
+    """One alternation for all globs, so a lookup is a single regex match."""
+    if not globs:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in globs), flags)
+
+
+def _normalize_path(path: str) -> str:
+    # resolve "..", symlinks and case so "logs/../data/users.json" cannot sneak past a prefix
+    return os.path.normcase(os.path.realpath(path))
+
+
+def _is_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def resolve_host(host: str) -> list:
+    """Addresses ``host`` resolves to (``ipaddress`` objects); empty when it does not resolve."""
+    try:
+        infos = socket.getaddrinfo(host, None)
+    except (socket.gaierror, UnicodeError):
+        return []
+    # scoped IPv6 results carry a "%zone" suffix
+    return [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+
+
+class PathMatcher:
+    """
+    Plain entries are directory/file prefixes kept in a component trie; the
+    rest are globs, matched against the file name when they contain no
+    separator ("*.key") and against the absolute path otherwise.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self._trie: Dict[str, dict] = {}
+        globs, name_globs = [], []
+        for pattern in patterns:
+            if _GLOB_CHARS & set(pattern):
+                if "/" in pattern or "\\" in pattern:
+                    globs.append(os.path.normcase(os.path.abspath(pattern)))
+                else:
+                    name_globs.append(os.path.normcase(pattern))
+                continue
+            node = self._trie
+            for part in self._parts(_normalize_path(pattern)):
+                node = node.setdefault(part, {})
+            node[None] = True  # terminal: everything below this prefix matches
+        self._globs = _combined_regex(globs)
+        self._name_globs = _combined_regex(name_globs)
+
+    @staticmethod
+    def _parts(path: str) -> List[str]:
+        # every path starts at the root component, so a "/" entry is a prefix of everything
+        return ["/"] + [p for p in path.replace("\\", "/").split("/") if p]
+
+    def matches(self, path: str) -> bool:
+        normalized = _normalize_path(path)
+        node = self._trie
+        for part in self._parts(normalized):
+            if None in node:
+                return True
+            node = node.get(part)
+            if node is None:
+                break
+        else:
+            if None in node:
+                return True
+        if self._name_globs and self._name_globs.match(os.path.basename(normalized)):
+            return True
+        return bool(self._globs and self._globs.match(normalized))
+
+
+class HostMatcher:
+    """
+    IP literals/CIDRs in sorted integer ranges (bisect); names exact or by
+    glob. A name that matches neither is resolved and its addresses are
+    checked against the ranges, so "metadata.internal" or "0xa9fea9fe"
+    cannot reach a denied network. Names that do not resolve match no range.
+    """
+
+    def __init__(self, patterns: List[str]):
+        ranges = {4: [], 6: []}
+        names, globs = set(), []
+        for pattern in patterns:
+            try:
+                network = ipaddress.ip_network(pattern, strict=False)
+            except ValueError:
+                if _GLOB_CHARS & set(pattern):
+                    globs.append(pattern.lower())
+                else:
+                    names.add(pattern.lower())
+                continue
+            ranges[network.version].append(network)
+        self._starts, self._ends = {}, {}
+        for version, networks in ranges.items():
+            collapsed = list(ipaddress.collapse_addresses(networks))
+            self._starts[version] = [int(n.network_address) for n in collapsed]
+            self._ends[version] = [int(n.broadcast_address) for n in collapsed]
+        self._names = names
+        self._globs = _combined_regex(globs, re.IGNORECASE)
+
+    def matches(self, host: str, address: Optional[str] = None) -> bool:
+        """``address`` is the already resolved (pinned) address of ``host``, checked instead of resolving again."""
+        host = host.strip().lower()
+        try:
+            addresses = [ipaddress.ip_address(host)]
+        except ValueError:
+            if host in self._names or (self._globs and self._globs.match(host)):
+                return True
+            if address is not None:
+                addresses = [ipaddress.ip_address(address)]
+            else:
+                addresses = resolve_host(host) if any(self._starts.values()) else []
+        return any(self._in_ranges(address) for address in addresses)
+
+    def _in_ranges(self, address) -> bool:
+        starts, ends = self._starts[address.version], self._ends[address.version]
+        index = bisect.bisect_right(starts, int(address)) - 1
+        return index >= 0 and int(address) <= ends[index]
+
+
+class CommandMatcher:
+    """Matches the program (first token, or its basename) of a command line."""
+
+    def __init__(self, patterns: List[str]):
+        self._exact = {p for p in patterns if not _GLOB_CHARS & set(p)}
+        self._globs = _combined_regex([p for p in patterns if _GLOB_CHARS & set(p)])
+
+    def matches(self, command: str) -> bool:
+        parts = command.split()
+        if not parts:
+            return False
+        program = parts[0]
+        for candidate in (program, os.path.basename(program)):
+            if candidate in self._exact or (self._globs and self._globs.match(candidate)):
+                return True
+        return False
+
+
+MATCHERS = {"path": PathMatcher, "host": HostMatcher, "command": CommandMatcher}
+
+
+class ArgumentPolicy:
+    """
+    Compiled argument constraints of one role.
+
+    Built once when the policy is loaded from ``{action: {argument:
+    {"allow": [...], "deny": [...]}}}``. A value is rejected when it matches
+    ``deny``, or when ``allow`` is given and it does not match it. Rules
+    under the action ``"*"`` apply to every action taking that argument, in
+    addition to the action's own rules. Host arguments that are not an IP or
+    a valid host name are always rejected.
+    """
+
+    def __init__(self, rules: dict):
+        self._rules = {}
+        for action, arguments in rules.items():
+            compiled = {}
+            for argument, lists in arguments.items():
+                kind = ARGUMENT_KINDS.get(argument)
+                if kind is None:
+                    raise ValueError(f"No constraint matcher for argument '{argument}' of '{action}'")
+                matcher = MATCHERS[kind]
+                allow = matcher(lists["allow"]) if "allow" in lists else None
+                deny = matcher(lists["deny"]) if lists.get("deny") else None
+                compiled[argument] = (allow, deny)
+            self._rules[action] = compiled
+        self._any = self._rules.pop("*", {})
+
+    def check(self, action: str, args: Optional[dict], pinned: Optional[dict] = None) -> Optional[str]:
+        """
+        Return a rejection reason, or None when every constrained argument passes.
+
+        ``pinned`` maps host arguments to the address the call will use (see
+        ``pin_hosts``); ranges are checked against it rather than a fresh lookup.
+        """
+        pinned = pinned or {}
+        rules = [self._rules.get(action, {}), self._any]
+        if not any(rules):
+            return None
+        args = args or {}
+        for argument, (allow, deny) in ((a, m) for r in rules for a, m in r.items()):
+            if argument not in args:
+                continue
+            values = split_paths(args[argument]) if argument == "paths" else [str(args[argument])]
+            for value in values:
+                extra = ()
+                if ARGUMENT_KINDS[argument] == "host":
+                    if not is_valid_host(value):
+                        return f"Permission denied: host '{value}' is not a valid IP address or host name."
+                    extra = (pinned.get(argument),)
+                if (deny is not None and deny.matches(value, *extra)) or \
+                        (allow is not None and not allow.matches(value, *extra)):
+                    return f"Permission denied: {argument} '{value}' is not allowed for {action}."
+        return None
+
+
+def pin_hosts(args: Optional[dict]) -> Optional[dict]:
+    """
+    Resolve every host argument once: ``{argument: address}`` for the call to
+    use and the constraints to check, so a name cannot be re-pointed (DNS
+    rebinding) between authorization and use. IP literals and invalid values
+    map to themselves; None when a valid name does not resolve.
+    """
+    pinned = {}
+    for argument, value in (args or {}).items():
+        if ARGUMENT_KINDS.get(argument) != "host" or not isinstance(value, str):
+            continue
+        host = value.strip()
+        if not is_valid_host(host) or _is_address(host):
+            pinned[argument] = host
+            continue
+        addresses = resolve_host(host)
+        if not addresses:
+            return None
+        pinned[argument] = str(addresses[0])
+    return pinned
+
+
+def check_args(session: dict, action: str, args: Optional[dict],
+               pinned: Optional[dict] = None) -> Optional[str]:
+    """Evaluate the session's compiled constraints (if any) for one call."""
+    policy = session.get("constraints")
+    return policy.check(action, args, pinned) if policy is not None else None
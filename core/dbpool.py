@@ -0,0 +1,99 @@
+# core/dbpool.py
+
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ReadPool:
+    """
+    Small pool of read-only SQLite connections for query and export paths.
+
+    Connections are opened with a ``mode=ro`` URI and kept open, so the
+    parsed schema, prepared statements (``cached_statements``) and each
+    connection's page cache survive between queries; a shared ``mmap_size``
+    lets all of them read pages straight from the OS page cache. With the
+    database in WAL mode, readers never block the audit writer.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, cached_statements: int = 256,
+                 cache_kib: int = 16 * 1024, mmap_bytes: int = 256 * 1024 * 1024):
+        self.db_path = db_path
+        self.size = size
+        self.cached_statements = cached_statements
+        self.cache_kib = cache_kib
+        self.mmap_bytes = mmap_bytes
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        uri = pathlib.Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False,
+                               cached_statements=self.cached_statements, isolation_level=None)
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_bytes)}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._open()
+                except Exception:
+                    self._opened -= 1
+                    raise
+        # pool exhausted: wait for a connection to come back
+        return self._idle.get()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for one autocommit query."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Borrow a connection inside one read transaction.
+
+        Every query made through it sees the same committed state, so reads
+        spanning several pages are consistent even while writers append.
+        """
+        conn = self._acquire()
+        try:
+            conn.execute("BEGIN")
+            # the snapshot is taken by the first read, so take it right away
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
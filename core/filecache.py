@@ -0,0 +1,114 @@
+# core/filecache.py
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from core.constraints import PathMatcher
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ContentCache:
+    """
+    LRU cache of decoded file contents, bounded by total bytes.
+
+    Entries are keyed by real path and stored with the file's
+    (mtime_ns, size, inode); a lookup only hits when the freshly stat'ed file
+    still has the same triple, so a changed, replaced or truncated file is
+    re-read. Files modified within ``min_age`` seconds are not cached, as a
+    second write within the same mtime tick could keep an identical triple.
+    Paths matching ``exclude`` (policy opt-out for sensitive files) are
+    never stored.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entry_bytes: Optional[int] = None,
+                 exclude=(), min_age: float = 1.0):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.configure(max_bytes, max_entry_bytes, exclude, min_age)
+
+    def configure(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entry_bytes: Optional[int] = None,
+                  exclude=(), min_age: float = 1.0) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+            self.min_age = min_age
+            self._exclude = PathMatcher(list(exclude)) if exclude else None
+        self.clear()
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> tuple:
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def get(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Cached content of ``path`` if it was stored for the same stat signature."""
+        key = os.path.realpath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self._signature(st):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                # stale: the file changed since it was cached
+                del self._entries[key]
+                self.bytes -= entry[2]
+            self.misses += 1
+            return None
+
+    def put(self, path: str, st: os.stat_result, content: str) -> None:
+        if self.max_bytes <= 0 or time.time() - st.st_mtime < self.min_age:
+            return
+        key = os.path.realpath(path)
+        if self._exclude is not None and self._exclude.matches(key):
+            return
+        size = sys.getsizeof(content)
+        if size > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            self._entries[key] = (self._signature(st), content, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(os.path.realpath(path), None)
+            if entry is not None:
+                self.bytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Process-wide cache used by SyscallEngine.read_file; sized from the policy at startup.
+FILE_CACHE = ContentCache()
@@ -0,0 +1,87 @@
+# core/fswalk.py
+
+import fnmatch
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+
+def parse_patterns(pattern: Optional[str]) -> Optional[List[str]]:
+    """Split a comma separated glob list ("*.py, *.txt") into patterns."""
+    if not pattern:
+        return None
+    patterns = [p.strip() for p in pattern.split(",") if p.strip()]
+    return patterns or None
+
+
+def _scan_one(directory: str, depth: int, patterns) -> Tuple[List[dict], List[str]]:
+    """List a single directory; returns (matching entries, subdirectory paths)."""
+    entries, subdirs = [], []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir:
+                        subdirs.append(entry.path)
+                    if patterns and not any(fnmatch.fnmatch(entry.name, p) for p in patterns):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append({
+                    "path": entry.path,
+                    "name": entry.name,
+                    "type": "dir" if is_dir else ("link" if entry.is_symlink() else "file"),
+                    "size": st.st_size,
+                    "mtime": st.st_mtime,
+                    "depth": depth,
+                })
+    except OSError:
+        # unreadable directories are skipped rather than aborting the walk
+        pass
+    entries.sort(key=lambda e: e["name"])
+    subdirs.sort()
+    return entries, subdirs
+
+
+def walk(root: str, max_depth: int = 0, patterns=None) -> Iterator[dict]:
+    """Depth-first, streaming walk; one directory is listed at a time."""
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        entries, subdirs = _scan_one(directory, depth, patterns)
+        yield from entries
+        if depth < max_depth:
+            stack.extend((d, depth + 1) for d in reversed(subdirs))
+
+
+def parallel_walk(root: str, max_depth: int = 0, patterns=None, workers: int = 4) -> Iterator[dict]:
+    """
+    Walk wide trees by listing sibling directories on a thread pool.
+
+    Entries are yielded per directory as soon as that directory has been
+    scanned, so ordering across directories is not deterministic.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending = {pool.submit(_scan_one, root, 0, patterns): 0}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                entries, subdirs = future.result()
+                if depth < max_depth:
+                    for sub in subdirs:
+                        pending[pool.submit(_scan_one, sub, depth + 1, patterns)] = depth + 1
+                yield from entries
+    finally:
+        # also runs when the consumer stops early (generator closed)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def format_entry(entry: dict) -> str:
+    kind = {"dir": "d", "link": "l"}.get(entry["type"], "-")
+    mtime = datetime.fromtimestamp(entry["mtime"]).strftime("%Y-%m-%d %H:%M")
+    return f"{kind} {entry['size']:>12} {mtime}  {entry['path']}"
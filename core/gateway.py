@@ -0,0 +1,157 @@
+# core/gateway.py
+
+import time
+from typing import Optional, Tuple
+from core.constraints import check_args, pin_hosts
+from core.metrics import METRICS
+from core.quota import QUOTAS, file_read_size
+from core.syscalls import SyscallEngine
+
+
+# action name -> (callable, required argument names, optional keyword names)
+ACTIONS = {
+    "read_file": (SyscallEngine.read_file, ("path",), ()),
+    "write_file": (SyscallEngine.write_file, ("path", "text"), ()),
+    "list_directory": (SyscallEngine.list_directory, ("path",), ("pattern",)),
+    "scan_tree": (SyscallEngine.scan_tree, ("path",), ("max_depth", "pattern", "workers")),
+    "hash_file": (SyscallEngine.hash_file, ("path",), ("algorithm",)),
+    "hash_files": (SyscallEngine.hash_files, ("paths",), ("algorithm", "workers")),
+    "tail_file": (SyscallEngine.tail_file, ("path",), ("lines", "cursor")),
+    "search_files": (SyscallEngine.search_files, ("paths", "pattern"),
+                     ("context", "max_matches", "ignore_case", "workers")),
+    "list_processes": (SyscallEngine.list_processes, (), ()),
+    "spawn_process": (SyscallEngine.spawn_process, ("command",), ()),
+    "ping_host": (SyscallEngine.ping_host, ("host",), ()),
+    "system_info": (SyscallEngine.system_info, (), ()),
+}
+
+
+class Gateway:
+    """
+    Headless service layer: authentication, RBAC, execution and auditing
+    of system actions without any Tk dependency.
+    """
+
+    def __init__(self, security_controller, policy_manager, audit_logger):
+        self.security_controller = security_controller
+        self.policy_manager = policy_manager
+        self.audit_logger = audit_logger
+
+    def login(self, username: str, password: str) -> Optional[dict]:
+        session = self.security_controller.authenticate(username, password)
+        self.audit_logger.record(username, "login", "success" if session else "failed")
+        return session
+
+    def is_allowed(self, session: dict, action: str) -> bool:
+        return action in session["permissions"]
+
+    def run(self, session: dict, action: str, args: dict = None,
+            queue_wait_ms: float = None) -> Tuple[str, bool, str, Optional[float]]:
+        """
+        Authorize and run an action without auditing.
+
+        :return: (status, success, result, duration_ms); duration is None when
+                 the action never ran (unknown, denied or bad arguments)
+        """
+        if args is None:
+            args = {}
+        elif not isinstance(args, dict):
+            return "failed", False, "Arguments must be an object.", None
+
+        if action not in ACTIONS:
+            return "failed", False, f"Unknown action '{action}'.", None
+
+        if not self.is_allowed(session, action):
+            return "denied", False, "Permission denied.", None
+
+        func, arg_names, optional_names = ACTIONS[action]
+        missing = [name for name in arg_names if name not in args]
+        if missing:
+            return "failed", False, f"Missing argument(s): {', '.join(missing)}", None
+
+        # host names are resolved once: the checked address is the one the call uses
+        pinned = pin_hosts(args)
+        if pinned is None:
+            return "failed", False, "Could not resolve host.", None
+        rejection = check_args(session, action, args, pinned)
+        if rejection:
+            return "denied", False, rejection, None
+        call_args = dict(args, **pinned)
+
+        rejection = QUOTAS.acquire(session, action, args)
+        if rejection:
+            return "throttled", False, rejection, None
+
+        options = {name: args[name] for name in optional_names if args.get(name) is not None}
+        if action == "spawn_process":
+            options["owner"] = session["username"]
+        success, result = False, None
+        try:
+            success, result, duration_ms = timed_call(action, func, *(call_args[name] for name in arg_names),
+                                                      queue_wait_ms=queue_wait_ms, **options)
+        finally:
+            # charge transferred bytes and hand back any spawn reservation, even on errors
+            QUOTAS.release(session, action, *io_bytes(action, args, success, result))
+        return ("success" if success else "failed"), success, result, duration_ms
+
+    def execute(self, session: dict, action: str, args: dict = None,
+                queue_wait_ms: float = None) -> Tuple[bool, str]:
+        """Authorize, run and audit a single action; returns (success, result)."""
+        try:
+            status, success, result, duration_ms = self.run(session, action, args, queue_wait_ms)
+        except Exception as exc:
+            # a crashing call is still audited
+            status, success, result, duration_ms = "failed", False, str(exc), None
+        self.audit_logger.record(session["username"], action, status, duration_ms,
+                                 args=audit_args(args), result_size=result_size(result))
+        return success, result
+
+
+def audit_args(args: Optional[dict]) -> Optional[dict]:
+    """Arguments worth keeping in the audit trail; file contents are reduced to a length."""
+    if not args or not isinstance(args, dict):
+        return None
+    summary = {}
+    for key, value in args.items():
+        if key == "text":
+            summary["text_len"] = len(str(value))
+            continue
+        if not isinstance(value, (int, float, bool)) and value is not None:
+            value = str(value)
+            if len(value) > 256:
+                value = value[:256] + "..."
+        summary[key] = value
+    return summary
+
+
+def io_bytes(action: str, args: dict, success: bool, result) -> Tuple[int, int]:
+    """(bytes_read, bytes_written) moved by a finished call, as charged to quotas."""
+    if not success:
+        return 0, 0
+    if action == "write_file":
+        return 0, len(str(args.get("text", "")))
+    read = file_read_size(action, args)
+    if read is not None:
+        return read, 0
+    return (len(result) if isinstance(result, str) else 0), 0
+
+
+def result_size(result) -> Optional[int]:
+    return len(result) if isinstance(result, (str, bytes)) else None
+
+
+def timed_call(action: str, func, *args, queue_wait_ms: float = None, **kwargs):
+    """Run a SyscallEngine call and record latency/bytes; returns (success, result, duration_ms)."""
+    # sized up front: a bad ``text`` argument must not lose the metrics/audit of a finished call
+    text = (args[1] if len(args) > 1 else kwargs.get("text")) if action == "write_file" else None
+    to_write = len(text) if isinstance(text, str) else 0
+
+    start = time.perf_counter()
+    success, result = func(*args, **kwargs)
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    bytes_written = to_write if success else 0
+    bytes_read = len(result) if success and action != "write_file" and isinstance(result, str) else 0
+    METRICS.observe(action, duration_ms, bytes_read=bytes_read, bytes_written=bytes_written,
+                    queue_wait_ms=queue_wait_ms, error=not success)
+    return success, result, duration_ms
@@ -0,0 +1,144 @@
+# core/hashing.py
+
+import hashlib
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+
+ALGORITHMS = ("sha256", "blake2b")
+CHUNK_SIZE = 1024 * 1024
+
+
+class DigestCache:
+    """LRU of digests keyed by (path, size, mtime_ns, inode, algorithm)."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str, st: os.stat_result, algorithm: str) -> tuple:
+        return (os.path.abspath(path), st.st_size, st.st_mtime_ns, st.st_ino, algorithm)
+
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            digest = self._entries.get(key)
+            if digest is not None:
+                self._entries.move_to_end(key)
+            return digest
+
+    def put(self, key: tuple, digest: str) -> None:
+        with self._lock:
+            self._entries[key] = digest
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+DIGEST_CACHE = DigestCache()
+
+
+def _new_hasher(algorithm: str):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unsupported algorithm '{algorithm}' (use one of: {', '.join(ALGORITHMS)})")
+    return hashlib.new(algorithm)
+
+
+def _digest_file(path: str, size: int, algorithm: str, chunk_size: int) -> str:
+    hasher = _new_hasher(algorithm)
+    with open(path, "rb") as fh:
+        if size > 0:
+            try:
+                # hashlib releases the GIL on large buffers, so mapped chunks
+                # hash in parallel across worker threads without extra copies
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, size, chunk_size):
+                            hasher.update(view[offset:offset + chunk_size])
+                    finally:
+                        view.release()
+                return hasher.hexdigest()
+            except (ValueError, OSError):
+                # not mappable (pipes, special files): fall back to buffered reads
+                fh.seek(0)
+                hasher = _new_hasher(algorithm)
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            read = fh.readinto(buffer)
+            if not read:
+                break
+            hasher.update(view[:read])
+    return hasher.hexdigest()
+
+
+def hash_file(path: str, algorithm: str = "sha256", chunk_size: int = CHUNK_SIZE,
+              cache: DigestCache = DIGEST_CACHE) -> dict:
+    """Hash one file; returns {"path", "digest", "size", "cached", "error"}."""
+    result = {"path": path, "digest": None, "size": 0, "cached": False, "error": None}
+    try:
+        _new_hasher(algorithm)
+        st = os.stat(path)
+        result["size"] = st.st_size
+        key = DigestCache.key(path, st, algorithm)
+        digest = cache.get(key) if cache is not None else None
+        if digest is not None:
+            result.update(digest=digest, cached=True)
+            return result
+        digest = _digest_file(path, st.st_size, algorithm, chunk_size)
+        if cache is not None:
+            cache.put(key, digest)
+        result["digest"] = digest
+    except (OSError, ValueError) as exc:
+        result["error"] = str(exc)
+    return result
+
+
+def iter_hash_files(paths: Iterable[str], algorithm: str = "sha256", workers: int = 4,
+                    cache: DigestCache = DIGEST_CACHE) -> Iterator[dict]:
+    """
+    Hash many files on a thread pool, yielding results as they complete.
+
+    Every result carries ``done``/``total`` progress counters and the
+    running throughput in MB/s (bytes actually hashed, cache hits excluded).
+    """
+    paths = list(paths)
+    start = time.perf_counter()
+    hashed_bytes = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(hash_file, p, algorithm, CHUNK_SIZE, cache) for p in paths]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            if not result["cached"] and not result["error"]:
+                hashed_bytes += result["size"]
+            elapsed = time.perf_counter() - start
+            result.update(done=done, total=len(paths),
+                          mb_per_sec=(hashed_bytes / 1e6 / elapsed) if elapsed else 0.0)
+            yield result
+
+
+def format_result(result: dict) -> str:
+    if result["error"]:
+        return f"ERROR  {result['path']}: {result['error']}"
+    marker = " (cached)" if result["cached"] else ""
+    return f"{result['digest']}  {result['path']}{marker}"
+
+
+def split_paths(paths) -> list:
+    """Accept a list or a comma/newline separated string of paths."""
+    if isinstance(paths, str):
+        paths = paths.replace("\n", ",").split(",")
+    return [p.strip() for p in paths if p and p.strip()]
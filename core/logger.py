@@ -1,84 +1,420 @@
 # core/logger.py
 
+import hashlib
+import json
 import sqlite3
+import threading
+import time
 from datetime import datetime
 import csv
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
+from core.dbpool import ReadPool
+from core.metrics import METRICS
+
+GENESIS_HASH = "0" * 64
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_EPOCH = datetime(1970, 1, 1)
+
+SQLITE_MAX_ID = 2 ** 63 - 1
+
+# lookup table per dictionary-encoded column
+LOOKUPS = {"user": "audit_user", "action": "audit_action", "status": "audit_status"}
+
+
+def chain_hash(prev_hash: str, username, action, status, timestamp, duration_ms,
+               args: Optional[str] = None, result_size: Optional[int] = None,
+               count: Optional[int] = None, first_timestamp: Optional[str] = None) -> str:
+    """Hash of one audit row chained to its predecessor (length-prefixed fields)."""
+    fields = [username, action, status, timestamp,
+              "" if duration_ms is None else repr(float(duration_ms))]
+    # rows without context hash exactly as they did before args were recorded
+    if args is not None or result_size is not None or count is not None:
+        fields += [args, "" if result_size is None else str(result_size)]
+    if count is not None:
+        fields += [str(count), first_timestamp]
+    payload = prev_hash + "".join(f"{len(str(f or ''))}:{f or ''}" for f in fields)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def encode_timestamp(timestamp: str) -> int:
+    """Local wall-clock string -> integer seconds (naive, so it round-trips exactly)."""
+    return int((datetime.strptime(timestamp, TIMESTAMP_FORMAT) - _EPOCH).total_seconds())
+
+
+def encode_args(args: Optional[dict]) -> Optional[str]:
+    if not args:
+        return None
+    return json.dumps(args, separators=(",", ":"), sort_keys=True, default=str)
 
 
 class AuditLogger:
-    def __init__(self, db_path: str):
+    """
+    Audit trail stored in a compact, dictionary-encoded schema.
+
+    ``audit_event`` rows hold small integer ids into the ``audit_user``,
+    ``audit_action`` and ``audit_status`` lookup tables (cached in memory),
+    an integer timestamp, compact JSON arguments and the result size. The
+    ``audit_log`` view exposes the original text columns for readers.
+    Queries and exports go through a pool of read-only connections; the
+    database runs in WAL mode so those readers never block writers.
+    """
+
+    def __init__(self, db_path: str, read_pool_size: int = 4):
         self.db_path = db_path
+        self._ids = {kind: {} for kind in LOOKUPS}
+        self._ids_lock = threading.Lock()
         self._initialize_database()
+        # opened lazily on the first query
+        self.read_pool = ReadPool(db_path, size=read_pool_size)
+
+    def _connect(self) -> sqlite3.Connection:
+        # autocommit mode so writers can take the lock up front with BEGIN IMMEDIATE
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
 
     def _initialize_database(self) -> None:
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
+        # persistent: readers get snapshots and writers append to the log concurrently
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("BEGIN IMMEDIATE")
+
+        for table in LOOKUPS.values():
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                )
+            """)
 
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS audit_log (
+            CREATE TABLE IF NOT EXISTS audit_event (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT,
-                action TEXT,
-                status TEXT,
-                timestamp TEXT
+                ts INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                action_id INTEGER NOT NULL,
+                status_id INTEGER NOT NULL,
+                duration_ms REAL,
+                args TEXT,
+                result_size INTEGER,
+                hash BLOB,
+                count INTEGER,
+                first_ts INTEGER
             )
         """)
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(audit_event)")}
+        if "count" not in columns:
+            # coalesced rows: ``count`` merged events from ``first_ts`` to ``ts``
+            cursor.execute("ALTER TABLE audit_event ADD COLUMN count INTEGER")
+            cursor.execute("ALTER TABLE audit_event ADD COLUMN first_ts INTEGER")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_user ON audit_event (user_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_action ON audit_event (action_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_status ON audit_event (status_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_coalesced ON audit_event (id) "
+                       "WHERE count IS NOT NULL")
 
-        conn.commit()
-        conn.close()
-
-    def record(self, username: str, action: str, status: str) -> None:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS audit_checkpoint (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                last_row_id INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                rows_verified INTEGER NOT NULL,
+                created_at TEXT
+            )
+        """)
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        legacy = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'audit_log'").fetchone()
+        if legacy:
+            self._migrate_legacy_table(cursor)
 
+        # text-shaped view preserving the original audit_log columns (rebuilt as columns are added)
+        cursor.execute("DROP VIEW IF EXISTS audit_log")
         cursor.execute("""
-            INSERT INTO audit_log (username, action, status, timestamp)
-            VALUES (?, ?, ?, ?)
-        """, (username, action, status, timestamp))
+            CREATE VIEW audit_log AS
+            SELECT e.id AS id, u.name AS username, a.name AS action, s.name AS status,
+                   datetime(e.ts, 'unixepoch') AS timestamp, e.duration_ms AS duration_ms,
+                   e.args AS args, e.result_size AS result_size, lower(hex(e.hash)) AS hash,
+                   e.count AS count, datetime(e.first_ts, 'unixepoch') AS first_timestamp
+            FROM audit_event e
+            JOIN audit_user u ON u.id = e.user_id
+            JOIN audit_action a ON a.id = e.action_id
+            JOIN audit_status s ON s.id = e.status_id
+        """)
+        cursor.execute("COMMIT")
 
-        conn.commit()
+        for kind, table in LOOKUPS.items():
+            self._ids[kind] = dict(cursor.execute(f"SELECT name, id FROM {table}").fetchall())
         conn.close()
 
-    def fetch_logs(self, limit: int = 1000, filters: dict = None) -> List[Tuple]:
+    def _migrate_legacy_table(self, cursor) -> None:
+        """Move rows from the old text ``audit_log`` table into ``audit_event``."""
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(audit_log)")}
+        duration = "duration_ms" if "duration_ms" in columns else "NULL"
+        stored_hash = "hash" if "hash" in columns else "NULL"
+        rows = cursor.execute(
+            f"SELECT id, username, action, status, timestamp, {duration}, {stored_hash} "
+            "FROM audit_log ORDER BY id").fetchall()
+
+        ids = {kind: {} for kind in LOOKUPS}
+        prev = GENESIS_HASH
+        events = []
+        for row_id, username, action, status, timestamp, duration_ms, digest in rows:
+            if stored_hash == "NULL":
+                # one-time migration: the table predates hash chaining, so every row is chained now
+                digest = chain_hash(prev, username, action, status, timestamp, duration_ms)
+            # a NULL hash in a chained table is kept as is, so verify() reports it as tampering
+            prev = digest or prev
+            events.append((
+                row_id, encode_timestamp(timestamp),
+                self._lookup_id(cursor, ids, "user", username),
+                self._lookup_id(cursor, ids, "action", action),
+                self._lookup_id(cursor, ids, "status", status),
+                duration_ms, bytes.fromhex(digest) if digest else None,
+            ))
+        cursor.executemany("""
+            INSERT INTO audit_event (id, ts, user_id, action_id, status_id, duration_ms, hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, events)
+        cursor.execute("DROP TABLE audit_log")
+
+    @staticmethod
+    def _lookup_id(cursor, cache: dict, kind: str, name) -> int:
+        name = "" if name is None else str(name)
+        known = cache[kind].get(name)
+        if known is not None:
+            return known
+        table = LOOKUPS[kind]
+        cursor.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+        known = cursor.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+        cache[kind][name] = known
+        return known
+
+    def _append(self, rows: List[tuple], extra_statements=()) -> None:
+        """
+        Insert (username, action, status, timestamp, duration_ms, args, result_size
+        [, count, first_timestamp]) rows, extending the hash chain. The chain head is read under the write
+        lock, so hashing for a whole batch costs one lookup plus one sha256 per row.
+
+        :param extra_statements: (sql, params) pairs committed atomically with the rows
+        """
+        conn = self._connect()
+        with self._ids_lock:
+            # new names found in this batch only join the shared cache after commit
+            ids = {kind: dict(names) for kind, names in self._ids.items()}
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            head = cursor.execute("SELECT hash FROM audit_event ORDER BY id DESC LIMIT 1").fetchone()
+            prev = head[0].hex() if head and head[0] else GENESIS_HASH
+            events = []
+            for row in rows:
+                username, action, status, timestamp, duration_ms, args, result_size, \
+                    count, first_timestamp = tuple(row) + (None,) * (9 - len(row))
+                prev = chain_hash(prev, username, action, status, timestamp, duration_ms,
+                                  args, result_size, count, first_timestamp)
+                events.append((
+                    encode_timestamp(timestamp),
+                    self._lookup_id(cursor, ids, "user", username),
+                    self._lookup_id(cursor, ids, "action", action),
+                    self._lookup_id(cursor, ids, "status", status),
+                    duration_ms, args, result_size, bytes.fromhex(prev), count,
+                    encode_timestamp(first_timestamp) if first_timestamp else None,
+                ))
+            cursor.executemany("""
+                INSERT INTO audit_event (ts, user_id, action_id, status_id, duration_ms,
+                                         args, result_size, hash, count, first_ts)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, events)
+            for sql, params in extra_statements:
+                cursor.execute(sql, params)
+            cursor.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        with self._ids_lock:
+            for kind, names in ids.items():
+                self._ids[kind].update(names)
+
+    def record(self, username: str, action: str, status: str,
+               duration_ms: Optional[float] = None, args: Optional[dict] = None,
+               result_size: Optional[int] = None) -> None:
+        start = time.perf_counter()
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+        self._append([(username, action, status, timestamp, duration_ms,
+                       encode_args(args), result_size)])
+        METRICS.observe("audit.record", (time.perf_counter() - start) * 1000)
+
+    def record_many(self, entries: Iterable[tuple]) -> int:
+        """
+        Record many entries in a single transaction.
+
+        :param entries: (username, action, status[, duration_ms[, args[, result_size[, timestamp]]]]);
+                        entries without a timestamp are stamped with the time of this call
+        """
+        start = time.perf_counter()
+        now = datetime.now().strftime(TIMESTAMP_FORMAT)
+        rows = []
+        for entry in entries:
+            entry = tuple(entry) + (None,) * (7 - len(entry))
+            username, action, status, duration_ms, args, result_size, timestamp = entry[:7]
+            rows.append((username, action, status, timestamp or now, duration_ms,
+                         encode_args(args), result_size))
+        if not rows:
+            return 0
+
+        self._append(rows)
+        METRICS.observe("audit.record_many", (time.perf_counter() - start) * 1000)
+        return len(rows)
+
+    def verify(self, full: bool = False, checkpoint: bool = True) -> dict:
+        """
+        Verify the audit hash chain.
+
+        Incremental mode starts at the most recent checkpoint whose anchor row
+        is still intact and only rehashes rows written after it; ``full``
+        rehashes the whole history. On success a new checkpoint is stored.
+
+        :return: dict with 'ok', 'rows_checked', 'start_id', 'last_id' and,
+                 on failure, 'bad_id' and 'reason'
+        """
+        conn = self._connect()
+        try:
+            start_id, prev = 0, GENESIS_HASH
+            if not full:
+                anchor = conn.execute(
+                    "SELECT last_row_id, hash FROM audit_checkpoint ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+                if anchor:
+                    row = conn.execute("SELECT hash FROM audit_event WHERE id = ?", (anchor[0],)).fetchone()
+                    if row is None or row[0] is None or row[0].hex() != anchor[1]:
+                        return {"ok": False, "rows_checked": 0, "start_id": anchor[0],
+                                "last_id": anchor[0], "bad_id": anchor[0],
+                                "reason": "checkpoint row missing or modified"}
+                    start_id, prev = anchor
+
+            checked, last_id = 0, start_id
+            for row_id, username, action, status, timestamp, duration_ms, args, result_size, stored, \
+                    count, first_timestamp in conn.execute(
+                    "SELECT id, username, action, status, timestamp, duration_ms, args, result_size, hash, "
+                    "count, first_timestamp FROM audit_log WHERE id > ? ORDER BY id", (start_id,)):
+                if not stored:
+                    return {"ok": False, "rows_checked": checked, "start_id": start_id,
+                            "last_id": last_id, "bad_id": row_id,
+                            "reason": "missing hash (row inserted or hash cleared outside the logger)"}
+                expected = chain_hash(prev, username, action, status, timestamp, duration_ms,
+                                      args, result_size, count, first_timestamp)
+                if stored != expected:
+                    return {"ok": False, "rows_checked": checked, "start_id": start_id,
+                            "last_id": last_id, "bad_id": row_id,
+                            "reason": "hash mismatch (row modified, inserted or a predecessor deleted)"}
+                prev, last_id = stored, row_id
+                checked += 1
+
+            if checkpoint and last_id > start_id:
+                conn.execute(
+                    "INSERT INTO audit_checkpoint (last_row_id, hash, rows_verified, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (last_id, prev, checked, datetime.now().strftime(TIMESTAMP_FORMAT)),
+                )
+            return {"ok": True, "rows_checked": checked, "start_id": start_id, "last_id": last_id}
+        finally:
+            conn.close()
+
+    def _log_query(self, filters: dict = None, include_context: bool = False):
+        """SELECT over audit_event for the given filters, or None when nothing can match."""
+        filters = filters or {}
+        clauses = []
+        params = []
+
+        # filters are translated to lookup ids so the integer indexes are used
+        for key, kind in (("username", "user"), ("action", "action"), ("status", "status")):
+            if key in filters and filters[key]:
+                with self._ids_lock:
+                    lookup_id = self._ids[kind].get(filters[key])
+                if lookup_id is None:
+                    lookup_id = self._refresh_id(kind, filters[key])
+                if lookup_id is None:
+                    return None
+                clauses.append(f"e.{kind}_id = ?")
+                params.append(lookup_id)
+
+        columns = "u.name, a.name, s.name, datetime(e.ts, 'unixepoch')"
+        if include_context:
+            columns += ", e.args, e.result_size, e.count, datetime(e.first_ts, 'unixepoch')"
+        query = f"""
+            SELECT {columns}, e.id
+            FROM audit_event e
+            JOIN audit_user u ON u.id = e.user_id
+            JOIN audit_action a ON a.id = e.action_id
+            JOIN audit_status s ON s.id = e.status_id
+            WHERE e.id < ? {''.join(f" AND {c}" for c in clauses)}
+            ORDER BY e.id DESC LIMIT ?
+        """
+        return query, params
+
+    def fetch_logs(self, limit: int = 1000, filters: dict = None,
+                   include_context: bool = False) -> List[Tuple]:
         """
         Fetch logs from the DB.
 
         :param limit: maximum number of rows to return
         :param filters: optional dict with keys 'username', 'action', 'status'
-        :return: list of tuples (username, action, status, timestamp)
+        :param include_context: also return the args, result_size, count and first_timestamp columns
+        :return: list of tuples (username, action, status, timestamp[, args, result_size, count,
+                 first_timestamp])
         """
-        filters = filters or {}
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        built = self._log_query(filters, include_context)
+        if built is None:
+            return []
+        query, params = built
+        with self.read_pool.connection() as conn:
+            rows = conn.execute(query, [SQLITE_MAX_ID, *params, limit]).fetchall()
+        return [row[:-1] for row in rows]
 
-        clauses = []
-        params = []
+    def iter_logs(self, limit: int = None, filters: dict = None, include_context: bool = False,
+                  page_size: int = 5000) -> Iterator[Tuple]:
+        """
+        Stream logs newest first in keyset-paginated pages.
 
-        if 'username' in filters and filters['username']:
-            clauses.append("username = ?")
-            params.append(filters['username'])
-        if 'action' in filters and filters['action']:
-            clauses.append("action = ?")
-            params.append(filters['action'])
-        if 'status' in filters and filters['status']:
-            clauses.append("status = ?")
-            params.append(filters['status'])
-
-        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-        query = f"SELECT username, action, status, timestamp FROM audit_log {where} ORDER BY id DESC LIMIT ?"
-        params.append(limit)
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
-        return rows
+        All pages are read inside one snapshot, so rows appended while the
+        iteration runs neither shift pages nor appear halfway through.
+        """
+        built = self._log_query(filters, include_context)
+        if built is None:
+            return
+        query, params = built
+        remaining = limit
+        with self.read_pool.snapshot() as conn:
+            before_id = SQLITE_MAX_ID
+            while remaining is None or remaining > 0:
+                size = page_size if remaining is None else min(page_size, remaining)
+                rows = conn.execute(query, [before_id, *params, size]).fetchall()
+                for row in rows:
+                    yield row[:-1]
+                if len(rows) < size:
+                    break
+                before_id = rows[-1][-1]
+                if remaining is not None:
+                    remaining -= len(rows)
+
+    def _refresh_id(self, kind: str, name: str) -> Optional[int]:
+        """Look up a name another process may have added since we cached the table."""
+        with self.read_pool.connection() as conn:
+            row = conn.execute(f"SELECT id FROM {LOOKUPS[kind]} WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        with self._ids_lock:
+            self._ids[kind][name] = row[0]
+        return row[0]
 
     def export_csv(self, csv_path: str, limit: int = 1000, filters: dict = None) -> None:
-        rows = self.fetch_logs(limit=limit, filters=filters)
+        # coalesced rows keep their event count and first timestamp, so totals survive the export
         with open(csv_path, "w", newline='', encoding="utf-8") as fh:
             writer = csv.writer(fh)
-            writer.writerow(["username", "action", "status", "timestamp"])
-            writer.writerows(rows)
+            writer.writerow(["username", "action", "status", "timestamp", "args", "result_size",
+                             "count", "first_timestamp"])
+            writer.writerows(self.iter_logs(limit=limit, filters=filters, include_context=True))
@@ -0,0 +1,224 @@
+# core/memdiag.py
+"""
+Memory diagnostics for long-running sessions.
+
+    python -m core.memdiag start                   # on a running --serve gateway
+    python -m core.memdiag snapshot                # store the baseline
+    python -m core.memdiag report --top 15         # top modules, growth since baseline, caches
+    python -m core.memdiag stop
+
+tracemalloc is only started on request, so there is no overhead until then.
+Allocations are grouped by the module that made them (``core.logger``,
+``ui.logs_tab``, ...). Size probes report the app's own caches and, in the
+UI, the contents of its widgets.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import tracemalloc
+import weakref
+from typing import Callable, Dict, List, Optional
+
+
+class _Probe:
+    def __init__(self, func: Callable, owner=None):
+        self.func = func
+        # widget probes hold their tab weakly, so the probe never keeps it alive
+        self.owner = weakref.ref(owner) if owner is not None else None
+
+    def read(self):
+        if self.owner is None:
+            return self.func()
+        owner = self.owner()
+        return None if owner is None else self.func(owner)
+
+
+_probes: Dict[str, _Probe] = {}
+_probes_lock = threading.Lock()
+
+
+def register_size_probe(name: str, func: Callable, owner=None) -> None:
+    """
+    Report ``func()`` (or ``func(owner)``) under ``name`` in every report.
+
+    With ``owner`` the probe disappears once the owner is garbage collected.
+    """
+    with _probes_lock:
+        _probes[name] = _Probe(func, owner)
+
+
+def cache_sizes() -> Dict[str, object]:
+    """Current value of every size probe; failing probes report their error."""
+    from core.filecache import FILE_CACHE
+    from core.hashing import DIGEST_CACHE
+    from core.metrics import METRICS
+
+    sizes = {
+        "core.filecache entries": len(FILE_CACHE),
+        "core.filecache bytes": FILE_CACHE.bytes,
+        "core.hashing digests": len(DIGEST_CACHE),
+        "core.metrics actions": len(METRICS.snapshot()),
+    }
+    with _probes_lock:
+        probes = list(_probes.items())
+    for name, probe in probes:
+        try:
+            value = probe.read()
+        except Exception as exc:
+            value = f"error: {exc}"
+        if value is None:
+            with _probes_lock:
+                if _probes.get(name) is probe:
+                    del _probes[name]
+            continue
+        sizes[name] = value
+    return sizes
+
+
+def _module_index() -> Dict[str, str]:
+    """Source file -> dotted module name for everything imported so far."""
+    index = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path:
+            index[os.path.normcase(os.path.abspath(path))] = name
+    return index
+
+
+class MemoryDiagnostics:
+    """tracemalloc control, baseline snapshot and per-module reports."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        with self._lock:
+            self.baseline = None
+        tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running; start tracing first.")
+        # the tracer's and this module's own bookkeeping is not part of the application
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def take_baseline(self) -> dict:
+        snapshot = self._snapshot()
+        with self._lock:
+            self.baseline = snapshot
+        return {"baseline_bytes": sum(stat.size for stat in snapshot.statistics("filename"))}
+
+    @staticmethod
+    def _by_module(stats, index: Dict[str, str]) -> Dict[str, List[int]]:
+        """Sum filename statistics per module: [size, size_diff, count, count_diff]."""
+        modules: Dict[str, List[int]] = {}
+        for stat in stats:
+            filename = stat.traceback[0].filename
+            name = index.get(os.path.normcase(os.path.abspath(filename)),
+                             os.path.splitext(os.path.basename(filename))[0])
+            totals = modules.setdefault(name, [0, 0, 0, 0])
+            totals[0] += stat.size
+            totals[1] += getattr(stat, "size_diff", 0)
+            totals[2] += stat.count
+            totals[3] += getattr(stat, "count_diff", 0)
+        return modules
+
+    def report(self, top: int = 15) -> dict:
+        """Top allocating modules, growth since the baseline and cache sizes."""
+        result = {"tracing": self.tracing, "caches": cache_sizes()}
+        if not self.tracing:
+            return result
+        current, peak = tracemalloc.get_traced_memory()
+        result.update(traced_bytes=current, peak_bytes=peak)
+        snapshot = self._snapshot()
+        index = _module_index()
+
+        modules = self._by_module(snapshot.statistics("filename"), index)
+        result["top_modules"] = [
+            {"module": name, "bytes": size, "blocks": count}
+            for name, (size, _, count, _) in sorted(modules.items(), key=lambda kv: -kv[1][0])[:top]
+        ]
+        with self._lock:
+            baseline = self.baseline
+        if baseline is not None:
+            growth = self._by_module(snapshot.compare_to(baseline, "filename"), index)
+            result["growth"] = [
+                {"module": name, "bytes": size, "bytes_diff": size_diff, "blocks_diff": count_diff}
+                for name, (size, size_diff, _, count_diff)
+                in sorted(growth.items(), key=lambda kv: -kv[1][1])[:top] if size_diff
+            ]
+            result["top_lines"] = [
+                {"line": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 "bytes_diff": stat.size_diff, "blocks_diff": stat.count_diff}
+                for stat in snapshot.compare_to(baseline, "lineno")[:top] if stat.size_diff
+            ]
+        return result
+
+    def command(self, name: str, top: int = 15, frames: int = 1) -> dict:
+        """Run one named command (start, snapshot, report, stop) and return a report."""
+        if name == "start":
+            self.start(frames)
+        elif name == "snapshot":
+            self.start(frames)
+            self.take_baseline()
+        elif name == "stop":
+            self.stop()
+        elif name != "report":
+            raise ValueError(f"Unknown memory command '{name}'.")
+        return self.report(top)
+
+
+# Process-wide diagnostics shared by the server and the UI panel.
+MEMORY = MemoryDiagnostics()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory diagnostics of a running gateway server")
+    parser.add_argument("command", choices=("start", "snapshot", "report", "stop"))
+    parser.add_argument("--host", default="127.0.0.1", help="server address")
+    parser.add_argument("--port", type=int, default=8765, help="server TCP port")
+    parser.add_argument("--socket", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--username", default="admin", help="admin account to authenticate as")
+    parser.add_argument("--password", default=os.environ.get("GATEWAY_PASSWORD", ""),
+                        help="password (default: $GATEWAY_PASSWORD)")
+    parser.add_argument("--top", type=int, default=15, help="modules/lines to report")
+    parser.add_argument("--frames", type=int, default=1, help="traceback depth when starting")
+    args = parser.parse_args(argv)
+
+    from core.server import GatewayClient
+    client = GatewayClient(args.host, args.port, args.socket)
+    try:
+        login = client.login(args.username, args.password)
+        if not login.get("ok"):
+            print(login.get("error"), file=sys.stderr)
+            return 1
+        response = client.request({"op": "memory", "token": client.token, "command": args.command,
+                                   "top": args.top, "frames": args.frames})
+    finally:
+        client.close()
+    if not response.get("ok"):
+        print(response.get("error"), file=sys.stderr)
+        return 1
+    print(json.dumps(response["result"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# core/metrics.py
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+# Bucket upper bounds in milliseconds: 0.01 ms .. ~84 s, doubling each step.
+BUCKET_BOUNDS_MS = tuple(0.01 * 2 ** i for i in range(24))
+
+
+class Histogram:
+    """Fixed log-scale histogram; recording is a bisect plus two adds."""
+
+    def __init__(self, bounds=BUCKET_BOUNDS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th quantile (0 < p <= 1)."""
+        if not self.count:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "max": round(self.max, 3),
+            "p50": round(self.percentile(0.50), 3),
+            "p95": round(self.percentile(0.95), 3),
+            "p99": round(self.percentile(0.99), 3),
+        }
+
+
+class _ActionStats:
+    def __init__(self):
+        self.duration_ms = Histogram()
+        self.queue_wait_ms = Histogram()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.errors = 0
+
+
+class MetricsRegistry:
+    """Per-action latency histograms and byte counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._actions: Dict[str, _ActionStats] = {}
+
+    def _stats(self, name: str) -> _ActionStats:
+        stats = self._actions.get(name)
+        if stats is None:
+            stats = self._actions.setdefault(name, _ActionStats())
+        return stats
+
+    def observe(self, name: str, duration_ms: float, bytes_read: int = 0,
+                bytes_written: int = 0, queue_wait_ms: Optional[float] = None,
+                error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats(name)
+            stats.duration_ms.observe(duration_ms)
+            if queue_wait_ms is not None:
+                stats.queue_wait_ms.observe(queue_wait_ms)
+            stats.bytes_read += bytes_read
+            stats.bytes_written += bytes_written
+            if error:
+                stats.errors += 1
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._actions.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "duration_ms": stats.duration_ms.snapshot(),
+                    "queue_wait_ms": stats.queue_wait_ms.snapshot(),
+                    "bytes_read": stats.bytes_read,
+                    "bytes_written": stats.bytes_written,
+                    "errors": stats.errors,
+                }
+                for name, stats in sorted(self._actions.items())
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the registry in Prometheus text exposition format."""
+        lines = [
+            "# TYPE gateway_action_duration_ms histogram",
+        ]
+        with self._lock:
+            items = sorted(self._actions.items())
+            for name, stats in items:
+                hist = stats.duration_ms
+                cumulative = 0
+                for bound, bucket_count in zip(hist.bounds, hist.counts):
+                    cumulative += bucket_count
+                    lines.append(f'gateway_action_duration_ms_bucket{{action="{name}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'gateway_action_duration_ms_bucket{{action="{name}",le="+Inf"}} {hist.count}')
+                lines.append(f'gateway_action_duration_ms_sum{{action="{name}"}} {hist.total:.3f}')
+                lines.append(f'gateway_action_duration_ms_count{{action="{name}"}} {hist.count}')
+
+            lines.append("# TYPE gateway_action_queue_wait_ms summary")
+            for name, stats in items:
+                for quantile in (0.5, 0.95, 0.99):
+                    lines.append(f'gateway_action_queue_wait_ms{{action="{name}",quantile="{quantile}"}} '
+                                 f'{stats.queue_wait_ms.percentile(quantile):g}')
+
+            for metric in ("bytes_read", "bytes_written", "errors"):
+                lines.append(f"# TYPE gateway_action_{metric}_total counter")
+                for name, stats in items:
+                    lines.append(f'gateway_action_{metric}_total{{action="{name}"}} {getattr(stats, metric)}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by the gateway, server, batch runner and UI.
+METRICS = MetricsRegistry()
@@ -1,12 +1,18 @@
 # core/policy.py
 
 import json
+from core.constraints import ArgumentPolicy
 
 
 class PolicyManager:
     def __init__(self, policy_file_path):
         self.policy_file_path = policy_file_path
         self.policy_data = self._load_policy()
+        # argument constraints are compiled once per role, not per call
+        self.constraints = {
+            role: ArgumentPolicy(rules)
+            for role, rules in self.policy_data.get("constraints", {}).items()
+        }
 
     def _load_policy(self):
         with open(self.policy_file_path, "r") as file:
@@ -14,3 +20,25 @@ class PolicyManager:
 
     def get_permissions(self, role):
         return self.policy_data.get(role, [])
+
+    def get_constraints(self, role):
+        """Compiled ArgumentPolicy for the role, or None when it has no constraints."""
+        return self.constraints.get(role)
+
+    def get_quotas(self, role, username=None):
+        """Resource limits for a user: role limits overridden key-by-key by user limits."""
+        quotas = self.policy_data.get("quotas", {})
+        limits = {}
+        if "window_seconds" in quotas:
+            limits["window_seconds"] = quotas["window_seconds"]
+        limits.update(quotas.get("roles", {}).get(role, {}))
+        limits.update(quotas.get("users", {}).get(username, {}))
+        return limits
+
+    def get_coalescing(self):
+        """The "audit_coalescing" section (window_seconds, exempt, actions), or None."""
+        return self.policy_data.get("audit_coalescing")
+
+    def get_file_cache(self):
+        """The "file_cache" section (max_bytes, max_entry_bytes, exclude), or an empty dict."""
+        return self.policy_data.get("file_cache", {})
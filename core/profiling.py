@@ -0,0 +1,271 @@
+# core/profiling.py
+"""
+On-demand profiling of individual actions and methods.
+
+    python -m core.profiling list_processes -n 5               # on a running --serve gateway
+    python -m core.profiling core.logger:AuditLogger.record -n 100
+
+Arming a target swaps in a profiling wrapper for its next N invocations and
+restores the original callable afterwards, so nothing is wrapped (and
+nothing costs anything) while profiling is off. Each run writes
+``<target>-<stamp>.pstats`` (cProfile, for ``pstats``/snakeviz) and
+``<target>-<stamp>.collapsed`` (sampled stacks, for flamegraph.pl or
+speedscope) to ``logs/profiles``.
+"""
+
+import argparse
+import cProfile
+import functools
+import importlib
+import inspect
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+DEFAULT_OUT_DIR = "logs/profiles"
+_RUNCALL_CODE = cProfile.Profile.runcall.__code__
+_MISSING = object()
+
+
+class _StackSampler:
+    """Samples one thread's Python stack every ``interval`` seconds while a call runs."""
+
+    def __init__(self, thread_id: int, counts: Counter, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.counts = counts
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            # stacks start at the profiled function, not at whoever called it
+            while frame is not None and frame.f_code is not _RUNCALL_CODE:
+                code = frame.f_code
+                stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class _Armed:
+    """One armed target: where the original lives and what has been collected."""
+
+    def __init__(self, name: str, remaining: int, out_dir: str, on_done: Optional[Callable]):
+        self.name = name
+        self.remaining = remaining
+        self.out_dir = out_dir
+        self.on_done = on_done
+        self.restore = []  # (container, key, original) to put back when done
+        self.stats: Optional[pstats.Stats] = None
+        self.stacks: Counter = Counter()
+        self.calls = 0
+
+
+class ActionProfiler:
+    """
+    Per-target profiling toggle.
+
+    A target is a gateway action name (``read_file``; the gateway table and
+    the ``SyscallEngine`` method are both wrapped, and streams run through
+    ``call``) or ``module:Qualified.name``
+    for any function or method, e.g. ``core.logger:AuditLogger.record`` or
+    ``ui.console:StreamingConsole._flush_pending`` for Tk rendering.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._armed: Dict[str, _Armed] = {}
+        # set while this thread is inside a profiled call: nested and recursive calls run plain
+        self._active = threading.local()
+
+    @staticmethod
+    def _locations(target: str):
+        """[(container, key)] holding the callable(s) to wrap for ``target``."""
+        if ":" not in target:
+            from core import gateway
+            from core.syscalls import SyscallEngine
+            if target not in gateway.ACTIONS:
+                raise ValueError(f"Unknown action '{target}'.")
+            return [(gateway.ACTIONS, target), (SyscallEngine, target)]
+        module_name, _, qualname = target.partition(":")
+        owner = importlib.import_module(module_name)
+        *parents, attribute = qualname.split(".")
+        for part in parents:
+            owner = getattr(owner, part)
+        if not callable(getattr(owner, attribute, None)):
+            raise ValueError(f"'{target}' is not a callable.")
+        return [(owner, attribute)]
+
+    def arm(self, target: str, count: int = 1, out_dir: str = DEFAULT_OUT_DIR,
+            on_done: Optional[Callable[[dict], None]] = None) -> None:
+        """Profile the next ``count`` invocations of ``target``."""
+        if count < 1:
+            raise ValueError("count must be at least 1.")
+        locations = self._locations(target)
+        with self._lock:
+            if target in self._armed:
+                raise ValueError(f"'{target}' is already being profiled.")
+            armed = _Armed(target, count, out_dir, on_done)
+            for container, key in locations:
+                if isinstance(container, dict):
+                    func, *rest = container[key]
+                    armed.restore.append((container, key, container[key]))
+                    container[key] = (self._wrap(armed, func), *rest)
+                else:
+                    # inherited attributes are shadowed, then deleted again on restore
+                    armed.restore.append((container, key, vars(container).get(key, _MISSING)))
+                    descriptor = inspect.getattr_static(container, key)
+                    if isinstance(descriptor, (staticmethod, classmethod)):
+                        wrapped = type(descriptor)(self._wrap(armed, descriptor.__func__))
+                    else:
+                        wrapped = self._wrap(armed, descriptor)
+                    setattr(container, key, wrapped)
+            self._armed[target] = armed
+
+    def disarm(self, target: str) -> Optional[dict]:
+        """Stop profiling ``target`` early; writes whatever was collected."""
+        with self._lock:
+            armed = self._armed.pop(target, None)
+            if armed is None:
+                return None
+            self._restore(armed)
+        return self._finish(armed)
+
+    def call(self, target: str, func: Callable, *args, **kwargs):
+        """
+        Run ``func`` as one invocation of ``target``: profiled while the target
+        is armed, plain otherwise. For code paths that do not go through the
+        wrapped callables, e.g. the Actions tab streaming ``tail_file``.
+        """
+        with self._lock:
+            armed = self._armed.get(target)
+        if armed is None:
+            return func(*args, **kwargs)
+        return self._wrap(armed, func)(*args, **kwargs)
+
+    def armed(self) -> Dict[str, int]:
+        """Armed targets and how many invocations each still has to profile."""
+        with self._lock:
+            return {name: armed.remaining for name, armed in self._armed.items()}
+
+    @staticmethod
+    def _restore(armed: _Armed) -> None:
+        for container, key, original in armed.restore:
+            if isinstance(container, dict):
+                container[key] = original
+            elif original is _MISSING:
+                delattr(container, key)
+            else:
+                setattr(container, key, original)
+
+    def _wrap(self, armed: _Armed, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(self._active, "on", False):
+                return func(*args, **kwargs)
+            with self._lock:
+                if armed.remaining <= 0:
+                    profile = None
+                else:
+                    armed.remaining -= 1
+                    profile = cProfile.Profile()
+            if profile is None:
+                # a concurrent call took the last slot
+                return func(*args, **kwargs)
+            stacks = Counter()
+            self._active.on = True
+            try:
+                with _StackSampler(threading.get_ident(), stacks):
+                    return profile.runcall(func, *args, **kwargs)
+            finally:
+                self._active.on = False
+                self._collect(armed, profile, stacks)
+
+        return wrapper
+
+    def _collect(self, armed: _Armed, profile: cProfile.Profile, stacks: Counter) -> None:
+        done = False
+        with self._lock:
+            if armed.stats is None:
+                armed.stats = pstats.Stats(profile)
+            else:
+                armed.stats.add(profile)
+            armed.stacks.update(stacks)
+            armed.calls += 1
+            if armed.remaining <= 0 and self._armed.get(armed.name) is armed:
+                del self._armed[armed.name]
+                self._restore(armed)
+                done = True
+        if done:
+            self._finish(armed)
+
+    def _finish(self, armed: _Armed) -> dict:
+        result = {"target": armed.name, "calls": armed.calls}
+        if armed.stats is not None:
+            os.makedirs(armed.out_dir, exist_ok=True)
+            base = os.path.join(armed.out_dir, "{}-{}".format(
+                armed.name.replace(":", "-").replace("/", "_"), time.strftime("%Y%m%d-%H%M%S")))
+            armed.stats.dump_stats(base + ".pstats")
+            with open(base + ".collapsed", "w", encoding="utf-8") as fh:
+                for stack, samples in sorted(armed.stacks.items()):
+                    fh.write(f"{stack} {samples}\n")
+            result.update(pstats=base + ".pstats", collapsed=base + ".collapsed",
+                          total_s=round(armed.stats.total_tt, 6))
+        if armed.on_done is not None:
+            armed.on_done(result)
+        return result
+
+
+# Process-wide profiler shared by the server and the Actions tab.
+PROFILER = ActionProfiler()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the next N calls of an action on a running gateway")
+    parser.add_argument("target", nargs="?", help="action name or module:Qualified.name")
+    parser.add_argument("-n", "--count", type=int, default=1, help="invocations to profile")
+    parser.add_argument("--stop", action="store_true", help="disarm the target and write what was collected")
+    parser.add_argument("--host", default="127.0.0.1", help="server address")
+    parser.add_argument("--port", type=int, default=8765, help="server TCP port")
+    parser.add_argument("--socket", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--username", default="admin", help="admin account to authenticate as")
+    parser.add_argument("--password", default=os.environ.get("GATEWAY_PASSWORD", ""),
+                        help="password (default: $GATEWAY_PASSWORD)")
+    args = parser.parse_args(argv)
+
+    from core.server import GatewayClient
+    client = GatewayClient(args.host, args.port, args.socket)
+    try:
+        login = client.login(args.username, args.password)
+        if not login.get("ok"):
+            print(login.get("error"), file=sys.stderr)
+            return 1
+        response = client.request({"op": "profile", "token": client.token, "target": args.target,
+                                   "count": args.count, "stop": args.stop})
+    finally:
+        client.close()
+    if not response.get("ok"):
+        print(response.get("error"), file=sys.stderr)
+        return 1
+    print(json.dumps(response["result"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
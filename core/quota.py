@@ -0,0 +1,157 @@
+# core/quota.py
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from core.hashing import split_paths
+from core.syscalls import SyscallEngine
+
+DEFAULT_WINDOW_SECONDS = 60
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._stamp = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def take(self, amount: float = 1) -> bool:
+        self._refill()
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def charge(self, amount: float) -> None:
+        """Consume unconditionally; the bucket may go into debt until refilled."""
+        self._refill()
+        self.tokens -= amount
+
+
+class QuotaAccountant:
+    """
+    In-memory per-user accounting of calls, bytes and spawned processes.
+
+    Limits come from the session (``session["quotas"]``, resolved from the
+    policy at login): ``calls_per_second`` and ``burst``,
+    ``bytes_read_per_window`` / ``bytes_written_per_window`` over
+    ``window_seconds``, and ``max_concurrent_spawns``; missing keys are not
+    limited. The Actions tab and every headless path share one accountant
+    per process. ``acquire`` is consulted before an action runs
+    and returns a rejection reason or None; ``release`` charges the bytes
+    actually read or written once it has finished.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[tuple, TokenBucket] = {}
+        self._pending_spawns: Dict[str, int] = {}
+
+    def _bucket(self, username: str, kind: str, rate: float, capacity: float) -> TokenBucket:
+        key = (username, kind)
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.capacity != capacity or bucket.rate != rate:
+            # created lazily, and rebuilt when the policy for this user changed
+            bucket = self._buckets[key] = TokenBucket(rate, capacity)
+        return bucket
+
+    def _window_bucket(self, username: str, kind: str, limits: dict) -> Optional[TokenBucket]:
+        limit = limits.get(f"{kind}_per_window")
+        if limit is None:
+            return None
+        window = limits.get("window_seconds", DEFAULT_WINDOW_SECONDS)
+        return self._bucket(username, kind, limit / window, limit)
+
+    def acquire(self, session: dict, action: str, args: dict = None) -> Optional[str]:
+        """Admit or reject one call; a rejection consumes nothing."""
+        limits = session.get("quotas") or {}
+        if not limits:
+            return None
+        username = session["username"]
+        args = args or {}
+
+        with self._lock:
+            reads = self._window_bucket(username, "bytes_read", limits)
+            if reads is not None and reads.available() < max(1, file_read_size(action, args) or 0):
+                return "Quota exceeded: read bytes for this window are used up."
+
+            writes = self._window_bucket(username, "bytes_written", limits)
+            if writes is not None and action == "write_file":
+                size = len(str(args.get("text", "")))
+                if size > writes.available():
+                    return "Quota exceeded: write bytes for this window are used up."
+
+            max_spawns = limits.get("max_concurrent_spawns")
+            pending = self._pending_spawns.get(username, 0)
+            if action == "spawn_process" and max_spawns is not None \
+                    and SyscallEngine.running_children(username) + pending >= max_spawns:
+                return f"Quota exceeded: at most {max_spawns} concurrent processes."
+
+            rate = limits.get("calls_per_second")
+            if rate is not None:
+                burst = limits.get("burst", max(1, rate * 2))
+                if not self._bucket(username, "calls", rate, burst).take():
+                    return f"Quota exceeded: more than {rate:g} calls per second."
+
+            if action == "spawn_process":
+                self._pending_spawns[username] = pending + 1
+        return None
+
+    def release(self, session: dict, action: str, bytes_read: int = 0, bytes_written: int = 0) -> None:
+        """Charge what an admitted call actually transferred."""
+        limits = session.get("quotas") or {}
+        if not limits:
+            return
+        username = session["username"]
+        with self._lock:
+            if action == "spawn_process":
+                self._pending_spawns[username] = max(0, self._pending_spawns.get(username, 0) - 1)
+            reads = self._window_bucket(username, "bytes_read", limits)
+            if reads is not None and bytes_read:
+                reads.charge(bytes_read)
+            writes = self._window_bucket(username, "bytes_written", limits)
+            if writes is not None and bytes_written:
+                writes.charge(bytes_written)
+
+
+# actions reading whole files: charged by file size, not by the (much smaller) output
+_FILE_READS = {"read_file": "path", "hash_file": "path", "hash_files": "paths", "search_files": "paths"}
+
+
+def file_read_size(action: str, args: dict) -> Optional[int]:
+    """
+    Bytes an action reads from disk (the sizes of its files), or None for
+    actions whose output size is the best measure.
+
+    Used both to admit a call and to charge it, so one digest line or a
+    handful of matches cannot hide a full scan of large files. A search
+    stopped early by its hit limit is still charged in full.
+    """
+    argument = _FILE_READS.get(action)
+    if argument is None:
+        return None
+    value = args.get(argument, "")
+    total = 0
+    for path in (split_paths(value) if argument == "paths" else [value]):
+        try:
+            total += os.path.getsize(path)
+        except (OSError, TypeError, ValueError):
+            pass
+    return total
+
+
+QUOTAS = QuotaAccountant()
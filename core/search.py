@@ -0,0 +1,258 @@
+# core/search.py
+
+import json
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+CHUNK_SIZE = 1024 * 1024
+# bytes of already-scanned complete lines kept in front of the next chunk, so a
+# match running over several lines is still found when it straddles a boundary
+OVERLAP = 64 * 1024
+# caller-supplied values are clamped to these bounds
+MAX_PATTERN_LENGTH = 1024
+MAX_CONTEXT = 10
+MAX_WORKERS = 16
+MAX_MATCHES = 10000
+# wall-clock limit of an isolated search; the child process is killed when it is reached
+SEARCH_TIMEOUT = 60.0
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def compile_pattern(pattern: str, ignore_case: bool = False):
+    """
+    Compile a text regex for byte buffers (``^``/``$`` match at line boundaries).
+
+    Patterns are user input and ``re`` backtracks: a pattern such as
+    ``(a+)+$`` can run for hours on one short line while holding the GIL,
+    freezing every thread of the process. Untrusted patterns must therefore
+    be run through ``isolated_search``, never ``iter_search`` in-process.
+    """
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise re.error(f"pattern is longer than {MAX_PATTERN_LENGTH} characters")
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(pattern.encode("utf-8"), flags)
+
+
+def _line_start(buf: bytes, pos: int, back: int = 0) -> int:
+    """Start of the line containing ``pos``, moved ``back`` further lines up."""
+    start = buf.rfind(b"\n", 0, pos) + 1
+    for _ in range(back):
+        if start == 0:
+            break
+        start = buf.rfind(b"\n", 0, start - 1) + 1
+    return start
+
+
+def _lines(buf: bytes, start: int, end: int) -> List[str]:
+    return [line.decode("utf-8", "replace").rstrip("\r") for line in buf[start:end].split(b"\n")]
+
+
+def search_file(path: str, regex, context: int = 0, chunk_size: int = CHUNK_SIZE,
+                stop_event: Optional[threading.Event] = None) -> Iterator[dict]:
+    """
+    Yield ``{"path", "line_no", "line", "before", "after"}`` for every matching line.
+
+    The file is read in chunks; only complete lines are searched, and the
+    partial last line plus ``OVERLAP`` bytes of scanned lines are carried
+    into the next chunk. A match whose trailing context (or possible
+    continuation) is not in the buffer yet is deferred to the next round, and
+    lines are reported once even when they are scanned twice.
+    """
+    with open(path, "rb") as fh:
+        buf = b""
+        base, base_line = 0, 1      # file offset and line number of buf[0]
+        reported_upto = 0           # file offset up to which lines have been reported
+        while stop_event is None or not stop_event.is_set():
+            chunk = fh.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            limit = len(buf) if eof else buf.rfind(b"\n") + 1
+            if limit == 0 and not eof:
+                continue  # one line longer than the chunk so far: keep reading
+
+            counted_pos, counted_lines = 0, base_line
+            carry_from = _line_start(buf, max(0, limit - min(OVERLAP, chunk_size)), context)
+            for match in regex.finditer(buf, 0, limit):
+                if base + match.start() < reported_upto:
+                    continue
+                start = _line_start(buf, match.start())
+                end = buf.find(b"\n", match.start(), limit)
+                end = limit if end < 0 else end
+                after_end = end
+                for _ in range(context):
+                    # at EOF a final newline does not start another line
+                    if after_end >= limit or (eof and after_end + 1 >= limit):
+                        break
+                    next_end = buf.find(b"\n", after_end + 1, limit)
+                    after_end = limit if next_end < 0 else next_end
+                if not eof and (match.end() >= limit or after_end >= limit):
+                    # trailing context or the match itself may continue in the next chunk
+                    carry_from = min(carry_from, _line_start(buf, start, context))
+                    break
+                counted_lines += buf.count(b"\n", counted_pos, start)
+                counted_pos = start
+                before_start = _line_start(buf, start, context)
+                yield {
+                    "path": path,
+                    "line_no": counted_lines,
+                    "line": buf[start:end].decode("utf-8", "replace").rstrip("\r"),
+                    # blank context lines are empty slices, so the ranges are checked, not the slices
+                    "before": _lines(buf, before_start, start - 1) if before_start < start else [],
+                    "after": _lines(buf, end + 1, after_end) if after_end > end else [],
+                }
+                reported_upto = base + end + 1
+            if eof:
+                return
+            base_line += buf.count(b"\n", 0, carry_from)
+            base += carry_from
+            buf = buf[carry_from:]
+
+
+def iter_search(paths: Iterable[str], regex, context: int = 0, workers: int = 4,
+                max_matches: Optional[int] = None,
+                stop_event: Optional[threading.Event] = None) -> Iterator[dict]:
+    """
+    Search many files on a thread pool, yielding matches as they are found.
+
+    Matches of one file stay in order; files are interleaved. Searching stops
+    once ``max_matches`` results were yielded, when ``stop_event`` is set, or
+    when the consumer closes the generator. Unreadable files yield an
+    ``{"path", "error"}`` result. ``context``, ``workers`` and ``max_matches``
+    are clamped to ``MAX_CONTEXT``, ``MAX_WORKERS`` and ``MAX_MATCHES``.
+    """
+    paths = list(paths)
+    context = max(0, min(int(context), MAX_CONTEXT))
+    workers = max(1, min(int(workers), MAX_WORKERS))
+    max_matches = MAX_MATCHES if max_matches is None else max(1, min(int(max_matches), MAX_MATCHES))
+    stop = threading.Event()
+    results: "queue.Queue" = queue.Queue(maxsize=1024)
+    done = object()
+
+    def put(item) -> bool:
+        # bounded queue: wait for the consumer, but give up once searching stopped
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work(path):
+        try:
+            for match in search_file(path, regex, context, stop_event=stop):
+                if not put(match):
+                    break
+        except OSError as exc:
+            put({"path": path, "error": str(exc)})
+        finally:
+            put(done)
+
+    found, finished = 0, 0
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(paths) or 1))
+    try:
+        for path in paths:
+            pool.submit(work, path)
+        while finished < len(paths):
+            if stop_event is not None and stop_event.is_set():
+                break
+            try:
+                item = results.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is done:
+                finished += 1
+                continue
+            yield item
+            if "error" not in item:
+                found += 1
+                if found >= max_matches:
+                    break
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def isolated_search(paths: Iterable[str], pattern: str, ignore_case: bool = False,
+                    context: int = 0, workers: int = 4, max_matches: Optional[int] = None,
+                    timeout: float = SEARCH_TIMEOUT,
+                    stop_event: Optional[threading.Event] = None) -> Iterator[dict]:
+    """
+    ``iter_search`` in a child process that is killed after ``timeout``
+    seconds, when ``stop_event`` is set, or when the consumer stops early.
+
+    A catastrophically backtracking pattern then burns one child process
+    instead of holding this process's GIL. A timeout yields a final
+    ``{"path": "*", "error": ...}`` result. Raises ``re.error`` for an
+    invalid pattern.
+    """
+    compile_pattern(pattern, ignore_case)  # fail fast, in-process, on a bad pattern
+    request = {"paths": list(paths), "pattern": pattern, "ignore_case": bool(ignore_case),
+               "context": int(context), "workers": int(workers),
+               "max_matches": None if max_matches is None else int(max_matches)}
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        p for p in (_PACKAGE_ROOT, os.environ.get("PYTHONPATH")) if p))
+    proc = subprocess.Popen([sys.executable, "-m", "core.search"], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, env=env)
+    results: "queue.Queue" = queue.Queue()
+
+    def read():
+        # a thread, so the deadline is enforced even while the child prints nothing
+        for line in proc.stdout:
+            results.put(json.loads(line))
+        results.put(None)
+
+    proc.stdin.write(json.dumps(request).encode("utf-8"))
+    proc.stdin.close()
+    threading.Thread(target=read, daemon=True).start()
+    deadline = time.monotonic() + timeout
+    try:
+        while stop_event is None or not stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                yield {"path": "*", "error": f"search stopped after {timeout:g}s (time limit)"}
+                return
+            try:
+                item = results.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            yield item
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdout.close()
+
+
+def _child_main() -> int:
+    """Entry point of the ``isolated_search`` child: JSON request on stdin, JSON lines out."""
+    request = json.load(sys.stdin)
+    regex = compile_pattern(request["pattern"], request["ignore_case"])
+    for match in iter_search(request["paths"], regex, request["context"], request["workers"],
+                             request["max_matches"]):
+        sys.stdout.write(json.dumps(match) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+def format_match(match: dict, show_path: bool = True) -> str:
+    if "error" in match:
+        return f"ERROR  {match['path']}: {match['error']}"
+    prefix = f"{match['path']}:" if show_path else ""
+    first = match["line_no"] - len(match["before"])
+    lines = [f"{prefix}{first + i}-{line}" for i, line in enumerate(match["before"])]
+    lines.append(f"{prefix}{match['line_no']}:{match['line']}")
+    lines += [f"{prefix}{match['line_no'] + 1 + i}-{line}" for i, line in enumerate(match["after"])]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    sys.exit(_child_main())
@@ -1,29 +1,35 @@
 # core/security.py
 
-import json
+from core.userstore import UserStore, open_user_store
 
 
 class SecurityController:
-    def __init__(self, users_file_path, policy_manager):
+    def __init__(self, users_file_path, policy_manager, user_store: UserStore = None):
         self.users_file_path = users_file_path
         self.policy_manager = policy_manager
-        self.users = self._load_users()
-
-    def _load_users(self):
-        with open(self.users_file_path, "r") as file:
-            return json.load(file)
+        self.user_store = user_store or open_user_store(users_file_path)
 
     def authenticate(self, username, password):
-        user = self.users.get(username)
-
-        if user and user["password"] == password:
-            role = user["role"]
-            permissions = self.policy_manager.get_permissions(role)
+        user = self.user_store.get_user(username)
 
-            return {
-                "username": username,
-                "role": role,
-                "permissions": permissions,
-            }
+        if user and self.user_store.check_password(user, password):
+            return self._make_session(username, user)
 
         return None
+
+    def session_for(self, username):
+        """Build a session without a password check (trusted batch/automation use)."""
+        user = self.user_store.get_user(username)
+        return self._make_session(username, user) if user else None
+
+    def _make_session(self, username, user):
+        role = user["role"]
+        permissions = self.policy_manager.get_permissions(role)
+
+        return {
+            "username": username,
+            "role": role,
+            "permissions": permissions,
+            "quotas": self.policy_manager.get_quotas(role, username),
+            "constraints": self.policy_manager.get_constraints(role),
+        }
@@ -0,0 +1,220 @@
+# core/server.py
+
+import asyncio
+import json
+import secrets
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from core.filecache import FILE_CACHE
+from core.gateway import Gateway
+from core.memdiag import MEMORY
+from core.metrics import METRICS
+from core.profiling import DEFAULT_OUT_DIR, PROFILER
+
+
+class GatewayServer:
+    """
+    Line-delimited JSON server in front of a Gateway (TCP or Unix socket).
+
+    Each line is one request; responses carry the request ``id`` and may be
+    returned out of order, so a client can pipeline many calls on one
+    connection. Supported requests::
+
+        {"id": 1, "op": "login", "username": "admin", "password": "..."}
+        {"id": 2, "token": "...", "action": "read_file", "args": {"path": "..."}}
+        {"id": 3, "username": "...", "password": "...", "action": "system_info"}
+        {"id": 4, "op": "logout", "token": "..."}
+        {"id": 5, "op": "metrics", "token": "...", "format": "json" | "prometheus"}
+        {"id": 6, "op": "memory", "token": "...", "command": "start" | "snapshot" | "report" | "stop"}
+        {"id": 7, "op": "profile", "token": "...", "target": "read_file", "count": 5}
+
+    A call may carry ``username``/``password`` instead of a token; it logs in
+    (and is audited) like the login op, but no session is kept. Metrics
+    reveal per-action activity, so they need a session as well.
+
+    Blocking syscalls run on a thread pool so the event loop keeps accepting
+    and parsing requests while actions execute.
+    """
+
+    def __init__(self, gateway: Gateway, max_workers: int = 32):
+        self.gateway = gateway
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.sessions = {}
+
+    async def _dispatch(self, request: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        op = request.get("op", "call")
+
+        if op == "login":
+            session = await loop.run_in_executor(
+                self.executor, self.gateway.login,
+                request.get("username", ""), request.get("password", ""),
+            )
+            if not session:
+                return {"ok": False, "error": "Invalid username or password."}
+            token = secrets.token_hex(16)
+            self.sessions[token] = session
+            return {"ok": True, "token": token, "role": session["role"],
+                    "permissions": session["permissions"]}
+
+        if op == "metrics":
+            if request.get("token") not in self.sessions:
+                return {"ok": False, "error": "Not authenticated."}
+            if request.get("format") == "prometheus":
+                return {"ok": True, "result": METRICS.to_prometheus()}
+            return {"ok": True, "result": METRICS.snapshot(), "file_cache": FILE_CACHE.stats()}
+
+        if op == "memory":
+            session = self.sessions.get(request.get("token"))
+            if session is None or session["role"] != "admin":
+                return {"ok": False, "error": "Memory diagnostics require an admin session."}
+            result = await loop.run_in_executor(
+                self.executor, MEMORY.command, request.get("command", "report"),
+                int(request.get("top", 15)), int(request.get("frames", 1)),
+            )
+            return {"ok": True, "result": result}
+
+        if op == "profile":
+            session = self.sessions.get(request.get("token"))
+            if session is None or session["role"] != "admin":
+                return {"ok": False, "error": "Profiling requires an admin session."}
+            # arming imports modules and disarming writes the profile: keep both off the loop
+            result = await loop.run_in_executor(
+                self.executor, self._profile, request.get("target"),
+                int(request.get("count", 1)), bool(request.get("stop")),
+            )
+            return {"ok": True, "result": result}
+
+        if op == "logout":
+            self.sessions.pop(request.get("token"), None)
+            return {"ok": True}
+
+        if op != "call":
+            return {"ok": False, "error": f"Unknown op '{op}'."}
+
+        session = self.sessions.get(request.get("token"))
+        if session is None and "username" in request:
+            session = await loop.run_in_executor(
+                self.executor, self.gateway.login,
+                request["username"], request.get("password", ""),
+            )
+            if not session:
+                return {"ok": False, "error": "Invalid username or password."}
+        if session is None:
+            return {"ok": False, "error": "Not authenticated."}
+
+        success, result = await loop.run_in_executor(
+            self.executor, self._execute, time.perf_counter(),
+            session, request.get("action", ""), request.get("args") or {},
+        )
+        return {"ok": success, "result": result}
+
+    @staticmethod
+    def _profile(target, count, stop):
+        if target and stop:
+            return PROFILER.disarm(target)
+        if target:
+            PROFILER.arm(target, count)
+        return {"armed": PROFILER.armed(), "out_dir": DEFAULT_OUT_DIR}
+
+    def _execute(self, submitted, session, action, args):
+        queue_wait_ms = (time.perf_counter() - submitted) * 1000
+        return self.gateway.execute(session, action, args, queue_wait_ms=queue_wait_ms)
+
+    async def _handle_request(self, line: bytes, writer, write_lock) -> None:
+        request = None
+        try:
+            request = json.loads(line)
+            response = await self._dispatch(request)
+        except (ValueError, AttributeError) as exc:
+            response = {"ok": False, "error": f"Bad request: {exc}"}
+        except Exception as exc:
+            response = {"ok": False, "error": str(exc)}
+        response["id"] = request.get("id") if isinstance(request, dict) else None
+
+        async with write_lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def _handle_client(self, reader, writer) -> None:
+        write_lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._handle_request(line, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765,
+                    unix_socket: Optional[str] = None):
+        if unix_socket:
+            return await asyncio.start_unix_server(self._handle_client, path=unix_socket,
+                                                   limit=2 ** 24)
+        return await asyncio.start_server(self._handle_client, host, port, limit=2 ** 24)
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765,
+                            unix_socket: Optional[str] = None) -> None:
+        server = await self.start(host, port, unix_socket)
+        async with server:
+            await server.serve_forever()
+
+    def run(self, host: str = "127.0.0.1", port: int = 8765,
+            unix_socket: Optional[str] = None) -> None:
+        try:
+            asyncio.run(self.serve_forever(host, port, unix_socket))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=False)
+
+
+class GatewayClient:
+    """Minimal blocking client for scripts and load tests."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 unix_socket: Optional[str] = None, timeout: float = 30.0):
+        if unix_socket:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(unix_socket)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.sock.settimeout(timeout)
+        self.file = self.sock.makefile("rwb")
+        self.token = None
+        self._next_id = 0
+
+    def request(self, payload: dict) -> dict:
+        self._next_id += 1
+        payload = dict(payload, id=self._next_id)
+        self.file.write(json.dumps(payload).encode() + b"\n")
+        self.file.flush()
+        return json.loads(self.file.readline())
+
+    def login(self, username: str, password: str) -> dict:
+        response = self.request({"op": "login", "username": username, "password": password})
+        self.token = response.get("token")
+        return response
+
+    def call(self, action: str, **args) -> dict:
+        return self.request({"token": self.token, "action": action, "args": args})
+
+    def metrics(self, fmt: str = "json"):
+        return self.request({"op": "metrics", "token": self.token, "format": fmt}).get("result")
+
+    def close(self) -> None:
+        self.file.close()
+        self.sock.close()
@@ -0,0 +1,254 @@
+# core/spool.py
+
+import glob
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+from core.logger import AuditLogger
+
+# record framing: payload length and CRC32, both big-endian uint32
+HEADER = struct.Struct(">II")
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class SpoolWriter:
+    """
+    Append-only, per-process spool of audit rows.
+
+    Each record is ``length | crc32 | json payload``; a torn tail left by a
+    crash fails the length/CRC check and is simply not ingested yet. A failed
+    write is cut back off the file, so later records never follow a torn
+    frame. Files
+    rotate at ``max_bytes`` and are named ``<host>-<pid>-<start>-<seq>.spool``.
+    """
+
+    def __init__(self, spool_dir: str, fsync: str = "interval", fsync_interval: float = 1.0,
+                 max_bytes: int = 64 * 1024 * 1024):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of: {', '.join(FSYNC_POLICIES)}")
+        self.spool_dir = spool_dir
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._prefix = f"{socket.gethostname()}-{os.getpid()}-{int(time.time())}"
+        self._seq = 0
+        self._fh = None
+        self._size = 0
+        self._last_sync = time.monotonic()
+        os.makedirs(spool_dir, exist_ok=True)
+
+    def _open_next(self) -> None:
+        if self._fh is not None:
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+        self._seq += 1
+        path = os.path.join(self.spool_dir, f"{self._prefix}-{self._seq:06d}.spool")
+        # unbuffered: every record reaches the OS as soon as it is written
+        self._fh = open(path, "ab", buffering=0)
+        self._size = self._fh.tell()
+
+    def append(self, rows: List[tuple]) -> None:
+        frames = []
+        for row in rows:
+            payload = json.dumps(row, separators=(",", ":")).encode("utf-8")
+            frames.append(HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        data = b"".join(frames)
+
+        with self._lock:
+            if self._fh is None or self._size + len(data) > self.max_bytes:
+                self._open_next()
+            start = self._size
+            view = memoryview(data)
+            try:
+                # a raw file may accept fewer bytes than asked: write the rest
+                while view:
+                    view = view[self._fh.write(view):]
+            except OSError:
+                self._discard_from(start)
+                raise
+            self._size += len(data)
+            now = time.monotonic()
+            if self.fsync == "always" or (
+                    self.fsync == "interval" and now - self._last_sync >= self.fsync_interval):
+                os.fsync(self._fh.fileno())
+                self._last_sync = now
+
+    def _discard_from(self, offset: int) -> None:
+        """Cut a partially written frame off the current file (or abandon the file)."""
+        try:
+            os.ftruncate(self._fh.fileno(), offset)
+        except OSError:
+            # the torn frame stays; the next append starts a fresh file behind it
+            self._fh.close()
+            self._fh = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                os.fsync(self._fh.fileno())
+                self._fh.close()
+                self._fh = None
+
+
+class SpoolingAuditLogger(AuditLogger):
+    """
+    AuditLogger whose writes go to a local spool instead of SQLite.
+
+    Reads (fetch_logs, verify, export) still use the database; rows appear
+    there once a SpoolIngester has merged them.
+    """
+
+    def __init__(self, db_path: str, spool_dir: str, fsync: str = "interval"):
+        super().__init__(db_path)
+        self.spool = SpoolWriter(spool_dir, fsync=fsync)
+
+    def _append(self, rows: List[tuple], extra_statements=()) -> None:
+        self.spool.append(rows)
+
+
+def read_records(path: str, offset: int, max_records: int) -> Tuple[List[tuple], int, Optional[int]]:
+    """
+    Read complete records from ``offset``.
+
+    :return: (rows, offset after the last good record, end of the corrupt
+             record found there or None); a complete record whose CRC does
+             not match is corrupt, an incomplete one may still be written
+    """
+    rows = []
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        while len(rows) < max_records:
+            header = fh.read(HEADER.size)
+            if len(header) < HEADER.size:
+                break
+            length, crc = HEADER.unpack(header)
+            payload = fh.read(length)
+            if len(payload) < length:
+                # partial record: stop here and retry on the next pass
+                break
+            if zlib.crc32(payload) != crc:
+                return rows, offset, offset + HEADER.size + length
+            rows.append(tuple(json.loads(payload)))
+            offset += HEADER.size + length
+    return rows, offset, None
+
+
+class SpoolIngester:
+    """
+    Single consumer that merges spool files into the audit database.
+
+    The per-file byte offset is committed in the same SQLite transaction as
+    the rows it covers, so every record is ingested exactly once even if the
+    ingester crashes mid-run. Corrupt records, and incomplete tails whose
+    writer has exited, are copied to ``<spool_dir>/quarantine`` and skipped
+    with a warning on stderr, so one bad frame never stalls the file.
+    """
+
+    def __init__(self, audit_logger: AuditLogger, spool_dir: str, batch_rows: int = 50_000):
+        if isinstance(audit_logger, SpoolingAuditLogger):
+            raise ValueError("SpoolIngester needs a database-backed AuditLogger")
+        self.audit_logger = audit_logger
+        self.spool_dir = spool_dir
+        self.batch_rows = batch_rows
+        self.quarantined = 0
+        conn = audit_logger._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS audit_spool_offset (
+                file TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL
+            )
+        """)
+        conn.close()
+
+    def _offsets(self) -> dict:
+        conn = self.audit_logger._connect()
+        offsets = dict(conn.execute("SELECT file, offset FROM audit_spool_offset").fetchall())
+        conn.close()
+        return offsets
+
+    def ingest_once(self) -> int:
+        """Merge everything currently readable; returns the number of rows ingested."""
+        total = 0
+        offsets = self._offsets()
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, "*.spool"))):
+            name = os.path.basename(path)
+            offset = offsets.get(name, 0)
+            while True:
+                rows, new_offset, bad_end = read_records(path, offset, self.batch_rows)
+                if rows:
+                    self.audit_logger._append(rows, extra_statements=[(
+                        "INSERT OR REPLACE INTO audit_spool_offset (file, offset) VALUES (?, ?)",
+                        (name, new_offset),
+                    )])
+                    total += len(rows)
+                    offset = new_offset
+                if bad_end is None and not rows and offset < os.path.getsize(path) \
+                        and _writer_gone(name):
+                    # an incomplete record nobody is going to finish
+                    bad_end = os.path.getsize(path)
+                if bad_end is not None:
+                    self._quarantine(path, name, offset, bad_end)
+                    offset = bad_end
+                elif not rows:
+                    break
+            self._maybe_remove(path, name, offset)
+        return total
+
+    def _quarantine(self, path: str, name: str, start: int, end: int) -> None:
+        """Copy an unreadable byte range aside and move the file's offset past it."""
+        directory = os.path.join(self.spool_dir, "quarantine")
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "rb") as src, open(os.path.join(directory, f"{name}.{start}"), "wb") as dst:
+            src.seek(start)
+            dst.write(src.read(end - start))
+        conn = self.audit_logger._connect()
+        conn.execute("INSERT OR REPLACE INTO audit_spool_offset (file, offset) VALUES (?, ?)",
+                     (name, end))
+        conn.close()
+        self.quarantined += 1
+        print(f"spool: quarantined {end - start} unreadable bytes of {name} at offset {start}",
+              file=sys.stderr)
+
+    def _maybe_remove(self, path: str, name: str, offset: int) -> None:
+        """Delete fully ingested files whose writer process has exited."""
+        if not _writer_gone(name):
+            return
+        if os.path.getsize(path) != offset:
+            return
+        os.remove(path)
+        conn = self.audit_logger._connect()
+        conn.execute("DELETE FROM audit_spool_offset WHERE file = ?", (name,))
+        conn.close()
+
+    def run(self, interval: float = 1.0, stop_event: Optional[threading.Event] = None) -> None:
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.ingest_once()
+            stop_event.wait(interval)
+
+
+def _writer_gone(name: str) -> bool:
+    """True if the spool file's writer ran on this host and has exited."""
+    host, pid = name.rsplit("-", 3)[0], int(name.rsplit("-", 3)[1])
+    return host == socket.gethostname() and not _pid_alive(pid)
+
+
+def _pid_alive(pid: int) -> bool:
+    # signal 0 is not a probe on Windows, so files are kept there (conservative)
+    if pid == os.getpid() or os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
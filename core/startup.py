@@ -0,0 +1,33 @@
+# core/startup.py
+
+import sys
+import time
+
+
+class StartupTimer:
+    """Collects named timestamps during startup (enabled by --profile-startup)."""
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.marks = []
+
+    def mark(self, name: str) -> None:
+        if self.enabled:
+            self.marks.append((name, time.perf_counter()))
+
+    def report(self, stream=None) -> None:
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        previous = self.origin
+        print("startup profile (ms since launch / delta):", file=stream)
+        for name, stamp in self.marks:
+            print(f"  {(stamp - self.origin) * 1000:9.1f}  +{(stamp - previous) * 1000:8.1f}  {name}",
+                  file=stream)
+            previous = stamp
+        stream.flush()
+
+
+# Created when main.py is first imported, so ``origin`` approximates process launch.
+STARTUP = StartupTimer()
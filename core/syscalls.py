@@ -1,9 +1,19 @@
 # core/syscalls.py
 
 import os
-import subprocess
 import platform
-import psutil  # install via: pip install psutil
+import re
+import threading
+from core import fswalk, hashing, search, tail
+from core.constraints import is_valid_host
+from core.filecache import FILE_CACHE
+
+# psutil and subprocess are imported inside the actions that need them so
+# that importing this module (and therefore the UI) stays cheap at startup.
+
+# pid -> (owner, Popen) for processes started by spawn_process
+_children = {}
+_children_lock = threading.Lock()
 
 
 class SyscallEngine:
@@ -16,7 +26,12 @@ class SyscallEngine:
 
         try:
             with open(path, "r") as file:
-                content = file.read()
+                # validated against the open file, so a swapped path cannot serve stale content
+                st = os.fstat(file.fileno())
+                content = FILE_CACHE.get(path, st)
+                if content is None:
+                    content = file.read()
+                    FILE_CACHE.put(path, st, content)
             return True, content
         except Exception as exc:
             return False, str(exc)
@@ -26,13 +41,102 @@ class SyscallEngine:
         try:
             with open(path, "w") as file:
                 file.write(text)
+            FILE_CACHE.invalidate(path)
             return True, "File written successfully."
         except Exception as exc:
             return False, str(exc)
 
+    @staticmethod
+    def iter_tree(path, max_depth=0, pattern=None, workers=1):
+        """
+        Stream directory entries (dicts) below ``path`` using os.scandir.
+
+        :param max_depth: 0 lists ``path`` only; n descends n levels
+        :param pattern: optional comma separated globs matched against names
+        :param workers: >1 lists sibling directories on a thread pool
+        """
+        patterns = fswalk.parse_patterns(pattern)
+        if int(workers) > 1:
+            return fswalk.parallel_walk(path, int(max_depth), patterns, int(workers))
+        return fswalk.walk(path, int(max_depth), patterns)
+
+    @staticmethod
+    def list_directory(path, pattern=None):
+        return SyscallEngine.scan_tree(path, max_depth=0, pattern=pattern)
+
+    @staticmethod
+    def scan_tree(path, max_depth=3, pattern=None, workers=1):
+        if not os.path.isdir(path):
+            return False, "Directory does not exist."
+
+        try:
+            lines = [fswalk.format_entry(entry)
+                     for entry in SyscallEngine.iter_tree(path, max_depth, pattern, workers)]
+            return True, "\n".join(lines)
+        except Exception as exc:
+            return False, str(exc)
+
+    @staticmethod
+    def hash_file(path, algorithm="sha256"):
+        result = hashing.hash_file(path, algorithm)
+        if result["error"]:
+            return False, result["error"]
+        return True, hashing.format_result(result)
+
+    @staticmethod
+    def hash_files(paths, algorithm="sha256", workers=4):
+        """Hash several files (list or comma separated) in parallel chunks."""
+        try:
+            paths = hashing.split_paths(paths)
+            if not paths:
+                return False, "No files given."
+            if algorithm not in hashing.ALGORITHMS:
+                return False, f"Unsupported algorithm '{algorithm}'."
+
+            lines, last = [], None
+            for last in hashing.iter_hash_files(paths, algorithm, int(workers)):
+                lines.append(hashing.format_result(last))
+            lines.append(f"-- {last['total']} files, {last['mb_per_sec']:.1f} MB/s --")
+            return True, "\n".join(lines)
+        except Exception as exc:
+            return False, str(exc)
+
+    @staticmethod
+    def search_files(paths, pattern, context=0, max_matches=1000, ignore_case=False, workers=4):
+        """Regex search over one or more files (list or comma separated), grep-style output."""
+        try:
+            paths = hashing.split_paths(paths)
+            if not paths:
+                return False, "No files given."
+            lines, found = [], 0
+            # runs in a child process: a backtracking pattern cannot freeze this one
+            for match in search.isolated_search(paths, pattern, bool(ignore_case), int(context),
+                                                int(workers), int(max_matches)):
+                lines.append(search.format_match(match))
+                found += "error" not in match
+            lines.append(f"-- {found} matching lines in {len(paths)} files --")
+            return True, "\n".join(lines)
+        except re.error as exc:
+            return False, f"Invalid pattern: {exc}"
+        except Exception as exc:
+            return False, str(exc)
+
+    @staticmethod
+    def tail_file(path, lines=10, cursor=None):
+        """
+        Last ``lines`` lines of ``path``, or only the lines appended since
+        ``cursor`` (returned in the trailer of the previous call).
+        """
+        try:
+            new_lines, next_cursor = tail.tail_file(path, int(lines), cursor)
+            return True, "\n".join(new_lines + [f"-- cursor {next_cursor} --"])
+        except Exception as exc:
+            return False, str(exc)
+
     @staticmethod
     def list_processes():
         try:
+            import psutil  # install via: pip install psutil
             processes = []
             for proc in psutil.process_iter(attrs=['pid', 'name']):
                 processes.append(f"{proc.info['pid']} — {proc.info['name']}")
@@ -41,24 +145,43 @@ class SyscallEngine:
             return False, str(exc)
 
     @staticmethod
-    def spawn_process(command):
+    def spawn_process(command, owner=None):
         try:
-            subprocess.Popen(command.split())
+            import subprocess
+            proc = subprocess.Popen(command.split())
+            with _children_lock:
+                _children[proc.pid] = (owner, proc)
             return True, f"Process '{command}' started successfully."
         except Exception as exc:
             return False, str(exc)
 
+    @staticmethod
+    def running_children(owner=None):
+        """Count still-running spawned processes (of ``owner``), reaping exited ones."""
+        with _children_lock:
+            for pid, (_, proc) in list(_children.items()):
+                if proc.poll() is not None:
+                    del _children[pid]
+            return sum(1 for who, _ in _children.values() if owner is None or who == owner)
+
     @staticmethod
     def ping_host(host):
+        if not is_valid_host(host):
+            return False, f"Invalid host '{host}'."
         try:
-            result = os.popen(f"ping -n 1 {host}").read()
-            return True, result
+            import subprocess
+            # argument list, no shell: the host can never be parsed as a command or an option
+            count = "-n" if platform.system() == "Windows" else "-c"
+            result = subprocess.run(["ping", count, "1", host], capture_output=True, text=True,
+                                    timeout=30)
+            return result.returncode == 0, result.stdout or result.stderr
         except Exception as exc:
             return False, str(exc)
 
     @staticmethod
     def system_info():
         try:
+            import psutil  # install via: pip install psutil
             info = {
                 "OS": platform.system(),
                 "Release": platform.release(),
@@ -0,0 +1,232 @@
+# core/tail.py
+
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+READ_SIZE = 64 * 1024
+
+
+class FileFollower:
+    """
+    Incremental reader for a growing file.
+
+    Remembers the byte offset and inode of ``path``: each ``read_new`` call
+    reads only bytes appended since the previous call. A file that shrinks
+    (truncation) is re-read from the start, and a new inode under the same
+    path (rotation) is picked up after draining what was left in the old one.
+    Incomplete trailing lines are held back until their newline arrives.
+    """
+
+    def __init__(self, path: str, offset: int = None, inode: int = None):
+        self.path = path
+        self.offset = offset
+        self.inode = inode
+        self._fh = None
+        self._partial = b""
+
+    def _open(self) -> bool:
+        try:
+            fh = open(self.path, "rb")
+        except OSError:
+            return False
+        st = os.fstat(fh.fileno())
+        if self.inode is not None and st.st_ino != self.inode:
+            # a different file now lives at this path: start at its beginning
+            self.offset = 0
+            self._partial = b""
+        self._fh, self.inode = fh, st.st_ino
+        if self.offset is None:
+            self.offset = st.st_size
+        return True
+
+    def tail_lines(self, count: int) -> List[str]:
+        """Return the last ``count`` lines and position the cursor at end of file."""
+        if self._fh is None and not self._open():
+            raise FileNotFoundError(f"No such file: '{self.path}'")
+        size = os.fstat(self._fh.fileno()).st_size
+        start, data = size, b""
+        # read backwards in blocks until enough newlines were seen
+        while start > 0 and data.count(b"\n") <= count:
+            step = min(READ_SIZE, start)
+            start -= step
+            self._fh.seek(start)
+            data = self._fh.read(step) + data
+        self.offset, self._partial = size, b""
+        lines = data.decode("utf-8", "replace").splitlines()
+        return lines[-count:] if count > 0 else []
+
+    def _drain(self) -> bytes:
+        self._fh.seek(self.offset)
+        chunks = []
+        while True:
+            chunk = self._fh.read(READ_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self.offset += len(chunk)
+        return b"".join(chunks)
+
+    def read_new(self) -> List[str]:
+        """Return complete lines appended since the last call."""
+        if self._fh is None and not self._open():
+            return []
+
+        size = os.fstat(self._fh.fileno()).st_size
+        if size < self.offset:
+            # truncated in place (copytruncate rotation, "> file")
+            self.offset, self._partial = 0, b""
+        data = self._partial + self._drain()
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+
+        try:
+            rotated = os.stat(self.path).st_ino != self.inode
+        except OSError:
+            rotated = False  # moved away, nothing new yet: keep reading the old handle
+        if rotated:
+            # the old file is finished: its unterminated last line is complete now
+            if self._partial:
+                lines.append(self._partial)
+            self.close()
+            if self._open():
+                lines.extend(self._drain().split(b"\n"))
+                self._partial = lines.pop()
+
+        return [line.decode("utf-8", "replace").rstrip("\r") for line in lines]
+
+    def cursor(self) -> str:
+        return f"{self.inode or 0}:{self.offset or 0}"
+
+    @classmethod
+    def from_cursor(cls, path: str, cursor: str) -> "FileFollower":
+        inode, _, offset = str(cursor).partition(":")
+        return cls(path, offset=int(offset), inode=int(inode) or None)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class _Inotify:
+    """Minimal ctypes binding watching one directory for changes to one name."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, path: str):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.path.dirname(os.path.abspath(path))
+        mask = (self.IN_MODIFY | self.IN_ATTRIB | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM
+                | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+        self.name = os.fsencode(os.path.basename(path))
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to ``timeout`` seconds; True when the watched name changed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        pos = 0
+        while pos + self.EVENT.size <= len(data):
+            _, _, _, length = self.EVENT.unpack_from(data, pos)
+            name = data[pos + self.EVENT.size:pos + self.EVENT.size + length].rstrip(b"\0")
+            if name == self.name:
+                return True
+            pos += self.EVENT.size + length
+        return False
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _watcher(path: str) -> Optional[_Inotify]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify(path)
+    except (OSError, AttributeError):
+        return None
+
+
+def follow(path: str, stop_event: threading.Event, initial_lines: int = 10,
+           poll_interval: float = 0.5) -> Iterator[List[str]]:
+    """
+    Yield batches of new lines from ``path`` until ``stop_event`` is set.
+
+    Waits on inotify where available and falls back to polling every
+    ``poll_interval`` seconds; with inotify the timeout doubles as a safety
+    net for filesystems that never emit events (network mounts) and bounds
+    how long a stop request takes to be noticed.
+    """
+    follower = FileFollower(path)
+    watcher = _watcher(path)
+    try:
+        first = follower.tail_lines(initial_lines)
+        if first:
+            yield first
+        while not stop_event.is_set():
+            lines = follower.read_new()
+            if lines:
+                yield lines
+                continue
+            if watcher is not None:
+                watcher.wait(poll_interval)
+            else:
+                stop_event.wait(poll_interval)
+    finally:
+        follower.close()
+        if watcher is not None:
+            watcher.close()
+
+
+def tail_file(path: str, lines: int = 10, cursor: str = None) -> Tuple[List[str], str]:
+    """
+    One-shot tail for request/response callers.
+
+    Without ``cursor`` returns the last ``lines`` lines; with the cursor from
+    a previous call returns only the lines appended since. Either way the
+    cursor to pass next time is returned alongside the lines.
+    """
+    if cursor:
+        follower = FileFollower.from_cursor(path, cursor)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No such file: '{path}'")
+        try:
+            new_lines = follower.read_new()
+            # the cursor only covers complete lines, so a partial line is re-read next time
+            follower.offset -= len(follower._partial)
+            return new_lines, follower.cursor()
+        finally:
+            follower.close()
+
+    follower = FileFollower(path)
+    try:
+        last = follower.tail_lines(int(lines))
+        return last, follower.cursor()
+    finally:
+        follower.close()
@@ -0,0 +1,146 @@
+# core/userstore.py
+
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+
+PBKDF2_ITERATIONS = 100_000
+
+
+def hash_password(password: str, iterations: int = PBKDF2_ITERATIONS) -> str:
+    """Return a salted PBKDF2 hash in the form ``pbkdf2_sha256$iters$salt$hex``."""
+    salt = os.urandom(16).hex()
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), iterations)
+    return f"pbkdf2_sha256${iterations}${salt}${digest.hex()}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    try:
+        scheme, iterations, salt, expected = encoded.split("$")
+    except ValueError:
+        return False
+    if scheme != "pbkdf2_sha256":
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+class UserStore:
+    """Interface for the user directory consulted by SecurityController."""
+
+    def get_user(self, username: str) -> Optional[dict]:
+        """Return ``{"role": ...}`` plus store-specific fields, or None."""
+        raise NotImplementedError
+
+    def check_password(self, user: dict, password: str) -> bool:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonUserStore(UserStore):
+    """The original flat ``users.json`` dict (plaintext passwords)."""
+
+    def __init__(self, users_file_path: str):
+        self.users_file_path = users_file_path
+        with open(users_file_path, "r") as file:
+            self.users = json.load(file)
+
+    def get_user(self, username):
+        return self.users.get(username)
+
+    def check_password(self, user, password):
+        return hmac.compare_digest(str(user["password"]), str(password))
+
+
+class SqliteUserStore(UserStore):
+    """
+    SQLite-backed user directory for large account lists.
+
+    Users are loaded lazily one row at a time (primary key lookup) and kept
+    in a small LRU cache, so memory stays flat regardless of directory size.
+    """
+
+    def __init__(self, db_path: str, cache_size: int = 1024):
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._initialize_database()
+
+    def _initialize_database(self) -> None:
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password_hash TEXT NOT NULL,
+                role TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_users_role ON users (role)")
+        self._conn.commit()
+
+    def get_user(self, username):
+        with self._lock:
+            user = self._cache.get(username)
+            if user is not None:
+                self._cache.move_to_end(username)
+                return user
+
+            row = self._conn.execute(
+                "SELECT password_hash, role FROM users WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            user = {"password_hash": row[0], "role": row[1]}
+            self._cache[username] = user
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return user
+
+    def check_password(self, user, password):
+        return verify_password(password, user["password_hash"])
+
+    def add_user(self, username: str, password: str, role: str) -> None:
+        self.add_users([(username, password, role)])
+
+    def add_users(self, users: Iterable[Tuple[str, str, str]]) -> int:
+        """Insert or replace (username, password, role) rows in one transaction."""
+        rows = [(name, hash_password(pw), role) for name, pw, role in users]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+                    rows,
+                )
+            for name, _, _ in rows:
+                self._cache.pop(name, None)
+        return len(rows)
+
+    def import_json(self, users_file_path: str) -> int:
+        """Bulk import a ``users.json`` file in the original format."""
+        with open(users_file_path, "r") as file:
+            data = json.load(file)
+        return self.add_users((name, u["password"], u["role"]) for name, u in data.items())
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+def open_user_store(path: str) -> UserStore:
+    """Pick a store implementation from the file extension."""
+    if path.endswith(SQLITE_SUFFIXES):
+        return SqliteUserStore(path)
+    return JsonUserStore(path)
@@ -1,27 +1,148 @@
 # main.py
 
-import tkinter as tk
-from ui.login_page import LoginPage
+from core.startup import STARTUP
+import argparse
+import json
+import os
+import sys
 from core.security import SecurityController
 from core.logger import AuditLogger
 from core.policy import PolicyManager
-from ui.theme import apply_dark_theme
+from core.filecache import FILE_CACHE
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Secure System Call Interface")
+    parser.add_argument("--users", default="data/users.json",
+                        help="user directory: users.json or a SQLite .db file")
+    parser.add_argument("--import-users", metavar="JSON",
+                        help="bulk import a users.json file into the --users SQLite store (.db) and exit")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the headless gateway server instead of the Tk UI")
+    parser.add_argument("--host", default="127.0.0.1", help="server bind address")
+    parser.add_argument("--port", type=int, help="server TCP port (default 8765)")
+    parser.add_argument("--socket", metavar="PATH", help="serve on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=32, help="server worker threads")
+    parser.add_argument("--agent", action="store_true",
+                        help="run a fleet agent serving system info/process snapshots "
+                             "(uses --host/--socket; --port defaults to 8766)")
+    parser.add_argument("--agent-token", metavar="TOKEN", default=os.environ.get("AGENT_TOKEN"),
+                        help="shared token required by the agent (default: $AGENT_TOKEN); "
+                             "without one the agent only binds to loopback")
+    parser.add_argument("--batch", metavar="JSONL", help="run requests from a JSONL file and exit")
+    parser.add_argument("--output", metavar="JSONL", help="batch results file (default: stdout)")
+    parser.add_argument("--parallel", type=int, default=8, help="batch worker threads")
+    parser.add_argument("--verify-audit", action="store_true",
+                        help="verify the audit log hash chain and exit (non-zero on tampering)")
+    parser.add_argument("--full", action="store_true",
+                        help="with --verify-audit: rehash the whole history, ignoring checkpoints")
+    parser.add_argument("--spool", metavar="DIR",
+                        help="write audit events to a per-process spool in DIR instead of SQLite")
+    parser.add_argument("--fsync", choices=("always", "interval", "never"), default="interval",
+                        help="spool fsync policy")
+    parser.add_argument("--ingest", metavar="DIR",
+                        help="run the single spool ingester for DIR (merges spools into SQLite)")
+    parser.add_argument("--once", action="store_true", help="with --ingest: one pass, then exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print a startup timing report to stderr")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    STARTUP.enabled = args.profile_startup
+    STARTUP.mark("core modules imported")
+
+    # Mode-specific modules are imported on demand to keep UI startup lean.
+    if args.import_users:
+        from core.userstore import SQLITE_SUFFIXES, SqliteUserStore
+        if not args.users.endswith(SQLITE_SUFFIXES):
+            print(f"--import-users needs a SQLite --users target ({', '.join(SQLITE_SUFFIXES)}), "
+                  f"e.g. --users data/users.db; got '{args.users}'", file=sys.stderr)
+            return 2
+        store = SqliteUserStore(args.users)
+        count = store.import_json(args.import_users)
+        store.close()
+        print(f"Imported {count} users into {args.users}")
+        return
+
+    if args.verify_audit:
+        report = AuditLogger("logs/actions.db").verify(full=args.full)
+        print(json.dumps(report))
+        return 0 if report["ok"] else 1
+
+    if args.agent:
+        from core.agent import AgentServer
+        port = args.port or 8766
+        agent = AgentServer(token=args.agent_token)
+        try:
+            agent.check_bind(args.host, args.socket)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        print(f"Agent listening on {args.socket or f'{args.host}:{port}'}")
+        agent.run(args.host, port, args.socket)
+        return
+
+    if args.ingest:
+        from core.spool import SpoolIngester
+        ingester = SpoolIngester(AuditLogger("logs/actions.db"), args.ingest)
+        if args.once:
+            print(f"Ingested {ingester.ingest_once()} audit rows")
+        else:
+            try:
+                ingester.run()
+            except KeyboardInterrupt:
+                pass
+        return
+
+    # Instantiate core controllers
+    policy_manager = PolicyManager("data/policy.json")
+    FILE_CACHE.configure(**policy_manager.get_file_cache())
+    security_controller = SecurityController(args.users, policy_manager)
+    if args.spool:
+        from core.spool import SpoolingAuditLogger
+        audit_logger = SpoolingAuditLogger("logs/actions.db", args.spool, fsync=args.fsync)
+    else:
+        audit_logger = AuditLogger("logs/actions.db")
+    from core.coalesce import CoalescingAuditLogger
+    audit_logger = CoalescingAuditLogger.from_policy(audit_logger, policy_manager)
+    STARTUP.mark("controllers ready")
+
+    if args.batch:
+        from core.batch import run_batch
+        from core.gateway import Gateway
+        gateway = Gateway(security_controller, policy_manager, audit_logger)
+        summary = run_batch(gateway, args.batch, args.output, parallelism=args.parallel)
+        print(json.dumps(summary), file=sys.stderr)
+        return
+
+    if args.serve:
+        from core.gateway import Gateway
+        from core.server import GatewayServer
+        gateway = Gateway(security_controller, policy_manager, audit_logger)
+        port = args.port or 8765
+        where = args.socket or f"{args.host}:{port}"
+        print(f"Gateway listening on {where}")
+        GatewayServer(gateway, max_workers=args.workers).run(args.host, port, args.socket)
+        return
+
+    import tkinter as tk
+    from ui.login_page import LoginPage
+    from ui.theme import apply_dark_theme
+    STARTUP.mark("ui modules imported")
 
-def main():
     root = tk.Tk()
-    apply_dark_theme(root) 
+    apply_dark_theme(root)
     root.title("Secure System Call Interface")
     root.geometry("480x360")
-    
-    # Instantiate core controllers
-    policy_manager = PolicyManager("data/policy.json")
-    security_controller = SecurityController("data/users.json", policy_manager)
-    audit_logger = AuditLogger("logs/actions.db")
 
     # Launch login interface
     LoginPage(root, security_controller, audit_logger)
+    STARTUP.mark("login page built")
+    root.after_idle(lambda: STARTUP.mark("first frame (login)"))
     root.mainloop()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,9 +1,21 @@
 # ui/actions_tab.py
 
 import tkinter as tk
-from tkinter import scrolledtext, ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from core import fswalk, hashing, search, tail
 from core.syscalls import SyscallEngine
+from core.gateway import timed_call, audit_args, result_size, io_bytes
+from core.constraints import check_args, pin_hosts
+from core.metrics import METRICS
+from core.quota import QUOTAS, file_read_size
+from core.memdiag import register_size_probe
+from core.profiling import PROFILER
+from ui.console import StreamingConsole
+import os
 import platform
+import re
+import threading
+import time
 
 # Theme + font helpers (match dashboard/login theme)
 def _font(size=12, weight="bold"):
@@ -29,23 +41,103 @@ class ActionsTab:
         self.master = master
         self.session = session
         self.audit_logger = audit_logger
+        # set to stop the running stream (tail follow, long scans)
+        self._stop_event = threading.Event()
+        # completed profiler runs waiting to be reported on the console
+        self._profile_notes = []
         self._build_interface()
+        register_size_probe("ui.actions_tab console", lambda tab: tab.console.stats(), owner=self)
 
     # ----------------------------------------------------
     def _is_allowed(self, action):
         """Check if the user's role allows the given action."""
         return action in self.session["permissions"]
 
-    def _log_and_show(self, success, action, result):
+    def _audit(self, success, action, duration_ms=None, args=None, size=None):
         status = "success" if success else "failed"
-        self.audit_logger.record(self.session["username"], action, status)
+        self.audit_logger.record(self.session["username"], action, status, duration_ms,
+                                 args=audit_args(args), result_size=size)
+
+    def _admit(self, action, args=None, pinned=None):
+        """Check argument constraints and quotas; rejections are audited and shown."""
+        status, rejection = "denied", check_args(self.session, action, args, pinned)
+        if rejection is None:
+            status, rejection = "throttled", QUOTAS.acquire(self.session, action, args)
+        if rejection is None:
+            return True
+        self.audit_logger.record(self.session["username"], action, status,
+                                 args=audit_args(args))
+        self._replace_output(rejection)
+        return False
+
+    def _call(self, action, func, args, *call_args, pinned=None, **options):
+        """Quota-checked, timed SyscallEngine call whose result replaces the console."""
+        if not self._admit(action, args, pinned):
+            return
+        success, result = False, None
+        try:
+            success, result, duration_ms = timed_call(action, func, *call_args, **options)
+        finally:
+            QUOTAS.release(self.session, action, *io_bytes(action, args, success, result))
+        self._log_and_show(success, action, result, duration_ms, args)
+
+    def _log_and_show(self, success, action, result, duration_ms=None, args=None):
+        self._audit(success, action, duration_ms, args, result_size(result))
+
+        # replace the console contents; large results are rendered across frames
+        self._replace_output(f"{result}")
+        self._write_profile_notes()
+
+    def _replace_output(self, text="", stop_event=None):
+        """
+        Stop the running stream and replace the console contents.
+
+        The stopped stream's late output is dropped, its finish callback still
+        runs. Returns the stop event of whatever owns the console now.
+        """
+        self._stop_event.set()
+        self._stop_event = stop_event or threading.Event()
+        self.console.set_text(text)
+        return self._stop_event
+
+    def _write_profile_notes(self):
+        while self._profile_notes:
+            self.console.write(self._profile_notes.pop(0))
+
+    def _arm_profiler(self):
+        """Profile the next N calls of an action (or module:Qualified.name)."""
+        target = self._prompt("Action or module:Qualified.name to profile:")
+        if not target:
+            return
+        count = self._prompt("Number of calls to profile:")
+        if count is None:
+            return
+
+        def done(result):
+            # runs inside the profiled call; shown once its output is on the console
+            self._profile_notes.append(f"\n-- profiled {result['calls']} call(s) of {result['target']}: "
+                                       f"{result.get('pstats', 'no data')} --\n")
 
-        # show result in output box (preserve original behavior: writable while writing)
-        self.output_box.configure(state="normal")
-        self.output_box.delete("1.0", tk.END)
-        self.output_box.insert(tk.END, f"{result}")
-        # keep editable state as original code did (left as normal)
-        self.output_box.configure(state="normal")
+        try:
+            PROFILER.arm(target.strip(), int(count or 1), on_done=done)
+        except (ValueError, ImportError, AttributeError) as exc:
+            messagebox.showerror("Profiler", str(exc))
+            return
+        self._replace_output(f"Profiling the next {int(count or 1)} call(s) of {target.strip()}.\n")
+
+    def _save_output(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
+            title="Save output"
+        )
+        if not path:
+            return
+        try:
+            self.console.save_to_file(path)
+            messagebox.showinfo("Output Saved", f"Output saved to:\n{path}")
+        except Exception as exc:
+            messagebox.showerror("Save Failed", str(exc))
 
     # ----------------------------------------------------
     def _build_interface(self):
@@ -74,10 +166,63 @@ class ActionsTab:
             fg="#7a4f4f",
             font=_font(10, "normal")
         ).pack(side="right", anchor="e")
+        save_btn = tk.Button(
+            title_row,
+            text="💾 Save Output",
+            font=_font(10),
+            bg=DARK_MAROON,
+            fg=TEXT_LIGHT,
+            activebackground=DARK_MAROON_HOVER,
+            bd=0,
+            padx=10,
+            pady=4,
+            cursor="hand2",
+            command=self._save_output
+        )
+        save_btn.pack(side="right", padx=(0, 12))
+        save_btn.bind("<Enter>", lambda e: save_btn.configure(bg=DARK_MAROON_HOVER))
+        save_btn.bind("<Leave>", lambda e: save_btn.configure(bg=DARK_MAROON))
+        stop_btn = tk.Button(
+            title_row,
+            text="⏹ Stop",
+            font=_font(10),
+            bg=DARK_MAROON,
+            fg=TEXT_LIGHT,
+            activebackground=DARK_MAROON_HOVER,
+            bd=0,
+            padx=10,
+            pady=4,
+            cursor="hand2",
+            command=lambda: self._stop_event.set()
+        )
+        stop_btn.pack(side="right", padx=(0, 8))
+        stop_btn.bind("<Enter>", lambda e: stop_btn.configure(bg=DARK_MAROON_HOVER))
+        stop_btn.bind("<Leave>", lambda e: stop_btn.configure(bg=DARK_MAROON))
+        if self.session.get("role") == "admin":
+            profile_btn = tk.Button(
+                title_row,
+                text="⏱ Profile",
+                font=_font(10),
+                bg=DARK_MAROON,
+                fg=TEXT_LIGHT,
+                activebackground=DARK_MAROON_HOVER,
+                bd=0,
+                padx=10,
+                pady=4,
+                cursor="hand2",
+                command=self._arm_profiler
+            )
+            profile_btn.pack(side="right", padx=(0, 8))
+            profile_btn.bind("<Enter>", lambda e: profile_btn.configure(bg=DARK_MAROON_HOVER))
+            profile_btn.bind("<Leave>", lambda e: profile_btn.configure(bg=DARK_MAROON))
+        # a follow must not outlive the tab
+        frame.bind("<Destroy>", lambda e: self._stop_event.set(), add="+")
 
         # ------------------ Output area ------------------
-        self.output_box = scrolledtext.ScrolledText(
+        # bounded streaming console: keeps the last N lines, spools the full stream
+        self.console = StreamingConsole(
             card,
+            scrollback=5000,
             width=100,
             height=18,
             font=("Consolas", 11),
@@ -87,21 +232,19 @@ class ActionsTab:
             padx=8,
             pady=8
         )
-        self.output_box.pack(fill="both", expand=True, padx=8, pady=(4, 12))
+        self.console.pack(fill="both", expand=True, padx=8, pady=(4, 12))
 
         # ------------------ Buttons area -----------------
         permitted_actions = [
             p for p in self.session["permissions"]
-            if p in ["read_file", "write_file", "list_processes", "spawn_process", "ping_host"]
+            if p in ["read_file", "write_file", "list_directory", "scan_tree", "hash_files",
+                     "tail_file", "search_files", "list_processes", "spawn_process", "ping_host"]
         ]
 
         if not permitted_actions:
             # Guest user or restricted role
-            self.output_box.insert(
-                tk.END,
-                "⚠ This user role has no permission to perform system actions."
-            )
-            self.output_box.configure(state="disabled")
+            self.console.write("⚠ This user role has no permission to perform system actions.")
+            self.console.configure(state="disabled")
             return
 
         btn_frame = tk.Frame(card, bg=INPUT_BG)
@@ -132,6 +275,11 @@ class ActionsTab:
         actions = [
             ("Read File", "📂", self._action_read_file, "read_file"),
             ("Write File", "✏️", self._action_write_file, "write_file"),
+            ("List Dir", "🗂️", self._action_list_directory, "list_directory"),
+            ("Scan Tree", "🌲", self._action_scan_tree, "scan_tree"),
+            ("Hash Files", "🔏", self._action_hash_files, "hash_files"),
+            ("Tail File", "📜", self._action_tail_file, "tail_file"),
+            ("Search Files", "🔍", self._action_search_files, "search_files"),
             ("List Processes", "📋", self._action_list_processes, "list_processes"),
             ("Spawn Process", "▶️", self._action_spawn_process, "spawn_process"),
             ("Ping Host", "📶", self._action_ping_host, "ping_host"),
@@ -149,8 +297,7 @@ class ActionsTab:
         path = self._prompt("Enter file path to read:")
         if not path:
             return
-        success, result = SyscallEngine.read_file(path)
-        self._log_and_show(success, "read_file", result)
+        self._call("read_file", SyscallEngine.read_file, {"path": path}, path)
 
     def _action_write_file(self):
         path = self._prompt("Enter file path to write:")
@@ -159,26 +306,189 @@ class ActionsTab:
         text = self._prompt("Enter text to write:")
         if text is None:
             return
-        success, result = SyscallEngine.write_file(path, text)
-        self._log_and_show(success, "write_file", result)
+        self._call("write_file", SyscallEngine.write_file, {"path": path, "text": text}, path, text)
+
+    def _action_list_directory(self):
+        path = self._prompt("Enter directory path to list:")
+        if not path:
+            return
+        pattern = self._prompt("Filter by glob (optional, e.g. *.log):")
+        if pattern is None:
+            return
+        self._stream_tree("list_directory", path, 0, pattern)
+
+    def _action_scan_tree(self):
+        path = self._prompt("Enter directory path to scan:")
+        if not path:
+            return
+        depth = self._prompt("Maximum depth (default 3):")
+        if depth is None:
+            return
+        pattern = self._prompt("Filter by glob (optional, e.g. *.py,*.txt):")
+        if pattern is None:
+            return
+        max_depth = int(depth) if depth.isdigit() else 3
+        self._stream_tree("scan_tree", path, max_depth, pattern, workers=4)
+
+    def _stream_tree(self, action, path, max_depth, pattern, workers=1):
+        """List entries on a worker thread and render them as they arrive."""
+        if not os.path.isdir(path):
+            self._log_and_show(False, action, "Directory does not exist.", args={"path": path})
+            return
+
+        def lines():
+            count = 0
+            for entry in SyscallEngine.iter_tree(path, max_depth, pattern or None, workers):
+                count += 1
+                yield fswalk.format_entry(entry)
+            yield f"-- {count} entries --"
+
+        self._stream(action, lines, {"path": path, "max_depth": max_depth, "pattern": pattern})
+
+    def _stream(self, action, make_lines, args=None, batch_lines=200, stop_event=None,
+                audit_start=False):
+        """
+        Run ``make_lines()`` on a worker thread, streaming lines into the console.
+
+        Lines are written in batches of ``batch_lines``. Starting a stream stops
+        the previous one; **Stop** sets ``stop_event`` (pass your own when the
+        generator must observe it too, e.g. a blocking follow). Open-ended
+        streams pass ``audit_start`` so they are audited when they begin, not
+        only once they end.
+        """
+        if not self._admit(action, args):
+            return
+        stop_event = self._replace_output(stop_event=stop_event)
+        if audit_start:
+            self._audit(True, action, args=dict(args or {}, follow="started"))
+            args = dict(args or {}, follow="stopped")
+        start = time.perf_counter()
+        streamed = {"size": 0}
+
+        def finish(success):
+            duration_ms = (time.perf_counter() - start) * 1000
+            METRICS.observe(action, duration_ms, bytes_read=streamed["size"], error=not success)
+            read = file_read_size(action, args)
+            QUOTAS.release(self.session, action,
+                           bytes_read=streamed["size"] if read is None else read)
+            self._audit(success, action, duration_ms, args, streamed["size"])
+            self._write_profile_notes()
+
+        def write(text):
+            streamed["size"] += len(text)
+            if self._stop_event is stop_event:
+                # a newer stream or result owns the console now
+                self.console.write(text)
+
+        def consume(batch):
+            for line in make_lines():
+                batch.append(line)
+                if len(batch) >= batch_lines:
+                    write("\n".join(batch) + "\n")
+                    batch.clear()
+                if stop_event.is_set():
+                    batch.append("-- stopped --")
+                    break
+            write("\n".join(batch) + "\n" if batch else "")
+
+        def worker():
+            batch = []
+            try:
+                # the whole stream counts as one call when the action is being profiled
+                PROFILER.call(action, consume, batch)
+                self.console.post(lambda: finish(True))
+            except Exception as exc:
+                write("\n".join(batch + [str(exc)]) + "\n")
+                self.console.post(lambda: finish(False))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _action_hash_files(self):
+        paths = self._prompt("Enter file path(s) to hash (comma separated):")
+        if not paths:
+            return
+        algorithm = self._prompt("Algorithm: sha256 or blake2b (default sha256):")
+        if algorithm is None:
+            return
+        algorithm = algorithm or "sha256"
+        if algorithm not in hashing.ALGORITHMS:
+            self._log_and_show(False, "hash_files", f"Unsupported algorithm '{algorithm}'.")
+            return
+
+        def lines():
+            last = None
+            for last in hashing.iter_hash_files(hashing.split_paths(paths), algorithm, workers=4):
+                yield f"[{last['done']}/{last['total']}] {hashing.format_result(last)}"
+            if last:
+                yield f"-- {last['mb_per_sec']:.1f} MB/s --"
+
+        self._stream("hash_files", lines, {"paths": paths, "algorithm": algorithm})
+
+    def _action_search_files(self):
+        paths = self._prompt("Enter file path(s) to search (comma separated):")
+        if not paths:
+            return
+        pattern = self._prompt("Regular expression to search for:")
+        if not pattern:
+            return
+        try:
+            search.compile_pattern(pattern)
+        except re.error as exc:
+            self._log_and_show(False, "search_files", f"Invalid pattern: {exc}",
+                               args={"paths": paths, "pattern": pattern})
+            return
+        stop_event = threading.Event()
+
+        def lines():
+            found = 0
+            # matches appear as workers find them; Stop ends the scan in every file
+            # in a child process, so a backtracking pattern cannot freeze the Tk thread
+            for match in search.isolated_search(hashing.split_paths(paths), pattern, context=2,
+                                                max_matches=1000, stop_event=stop_event):
+                found += "error" not in match
+                yield search.format_match(match) + ("\n--" if match.get("before") or match.get("after") else "")
+            yield f"-- {found} matching lines --"
+
+        self._stream("search_files", lines, {"paths": paths, "pattern": pattern}, batch_lines=20,
+                     stop_event=stop_event)
+
+    def _action_tail_file(self):
+        path = self._prompt("Enter file path to follow:")
+        if not path:
+            return
+        if not os.path.isfile(path):
+            self._log_and_show(False, "tail_file", "File does not exist.", args={"path": path})
+            return
+        stop_event = threading.Event()
+
+        def lines():
+            # only appended bytes are read; inotify wakes the follower on change
+            for batch in tail.follow(path, stop_event, initial_lines=20):
+                yield "\n".join(batch)
+
+        self._stream("tail_file", lines, {"path": path}, batch_lines=1, stop_event=stop_event,
+                     audit_start=True)
 
     def _action_list_processes(self):
-        success, result = SyscallEngine.list_processes()
-        self._log_and_show(success, "list_processes", result)
+        self._call("list_processes", SyscallEngine.list_processes, None)
 
     def _action_spawn_process(self):
         command = self._prompt("Enter command to run (example: notepad):")
         if not command:
             return
-        success, result = SyscallEngine.spawn_process(command)
-        self._log_and_show(success, "spawn_process", result)
+        self._call("spawn_process", SyscallEngine.spawn_process, {"command": command}, command,
+                   owner=self.session["username"])
 
     def _action_ping_host(self):
         host = self._prompt("Enter hostname/IP to ping:")
         if not host:
             return
-        success, result = SyscallEngine.ping_host(host)
-        self._log_and_show(success, "ping_host", result)
+        # resolved once: the address checked against the constraints is the one pinged
+        pinned = pin_hosts({"host": host})
+        if pinned is None:
+            self._log_and_show(False, "ping_host", f"Could not resolve host '{host}'.", args={"host": host})
+            return
+        self._call("ping_host", SyscallEngine.ping_host, {"host": host}, pinned["host"], pinned=pinned)
 
     # ----------------------------------------------------
     # PROMPT DIALOG
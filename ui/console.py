@@ -0,0 +1,164 @@
+# ui/console.py
+
+import tkinter as tk
+from tkinter import scrolledtext
+import queue
+import shutil
+import tempfile
+
+
+class StreamingConsole:
+    """
+    Bounded, incrementally updated output console.
+
+    ``write`` may be called from any thread: chunks are queued and a pump
+    running on the Tk thread inserts them in one batch per frame. Only the
+    last ``scrollback`` lines are kept in the widget, while the complete
+    stream is spooled to a temporary file so ``save_to_file`` can still
+    export everything.
+    """
+
+    def __init__(self, master, scrollback: int = 5000, frame_ms: int = 30, idle_ms: int = 120,
+                 max_chars_per_frame: int = 256 * 1024, **text_options):
+        self.master = master
+        self.scrollback = scrollback
+        self.frame_ms = frame_ms
+        self.idle_ms = idle_ms
+        self.max_chars_per_frame = max_chars_per_frame
+        self.text = scrolledtext.ScrolledText(master, **text_options)
+        self._queue = queue.Queue()
+        self._pending = ""
+        self._spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self._closed = False
+        self.text.bind("<Destroy>", self._on_destroy, add="+")
+        self.text.after(self.idle_ms, self._pump)
+
+    # geometry passthrough so the console packs like the widget it replaces
+    def pack(self, **options):
+        self.text.pack(**options)
+
+    def configure(self, **options):
+        self.text.configure(**options)
+
+    # ------------------------------------------------------------------
+    def write(self, chunk: str) -> None:
+        """Queue text for display (thread-safe)."""
+        # split huge results so no single frame inserts more than the budget
+        step = self.max_chars_per_frame
+        for offset in range(0, len(chunk), step):
+            self._queue.put(chunk[offset:offset + step])
+
+    def post(self, callback) -> None:
+        """Run ``callback`` on the Tk thread after everything queued so far is shown."""
+        self._queue.put(callback)
+
+    def clear(self) -> None:
+        """
+        Drop queued and displayed output (Tk thread only).
+
+        Posted callbacks are kept and still run in order: they finish
+        streams (audit rows, quota release) and must not be lost.
+        """
+        self._discard_queue(keep_callbacks=True)
+        self.text.configure(state="normal")
+        self.text.delete("1.0", tk.END)
+        self._spool.seek(0)
+        self._spool.truncate()
+
+    def set_text(self, text: str) -> None:
+        self.clear()
+        self.write(text)
+
+    def save_to_file(self, path: str) -> None:
+        """Write the complete stream (not just the visible scrollback) to ``path``."""
+        self._flush_pending()
+        self._spool.flush()
+        self._spool.seek(0)
+        with open(path, "w", encoding="utf-8") as out:
+            shutil.copyfileobj(self._spool, out)
+        self._spool.seek(0, 2)
+
+    def stats(self) -> dict:
+        """Widget contents and buffered output, for memory diagnostics (Tk thread only)."""
+        if self._closed:
+            return {}
+        return {
+            "lines": int(self.text.index("end-1c").split(".")[0]),
+            "chars": int(self.text.count("1.0", tk.END, "chars")[0]),
+            "queued_chunks": self._queue.qsize(),
+            "spooled_bytes": self._spool.tell(),
+        }
+
+    # ------------------------------------------------------------------
+    def _discard_queue(self, keep_callbacks: bool = False) -> None:
+        self._pending = ""
+        callbacks = []
+        try:
+            while True:
+                item = self._queue.get_nowait()
+                if keep_callbacks and callable(item):
+                    callbacks.append(item)
+        except queue.Empty:
+            pass
+        for callback in callbacks:
+            self._queue.put(callback)
+
+    def _pump(self) -> None:
+        # Tk calls are only ever made here, on the Tk thread; workers just queue
+        if self._closed:
+            return
+
+        parts, size = [], 0
+        callbacks = []
+        try:
+            while size < self.max_chars_per_frame:
+                item = self._queue.get_nowait()
+                if callable(item):
+                    # keep ordering: flush text gathered so far before the callback
+                    self._pending += "".join(parts)
+                    parts, size = [], 0
+                    self._flush_pending()
+                    callbacks.append(item)
+                    break
+                parts.append(item)
+                size += len(item)
+        except queue.Empty:
+            pass
+
+        self._pending += "".join(parts)
+        self._flush_pending()
+
+        for callback in callbacks:
+            callback()
+
+        # poll quickly while output is flowing, slowly when idle
+        busy = bool(parts or callbacks) or not self._queue.empty()
+        self.text.after(self.frame_ms if busy else self.idle_ms, self._pump)
+
+    def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        chunk, self._pending = self._pending, ""
+        self._spool.write(chunk)
+
+        at_bottom = self.text.yview()[1] >= 0.999
+        state = self.text.cget("state")
+        self.text.configure(state="normal")
+        self.text.insert(tk.END, chunk)
+
+        # ring buffer: drop the oldest lines beyond the scrollback limit
+        line_count = int(self.text.index("end-1c").split(".")[0])
+        excess = line_count - self.scrollback
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+
+        self.text.configure(state=state)
+        if at_bottom:
+            self.text.see(tk.END)
+
+    def _on_destroy(self, event=None) -> None:
+        if event is not None and event.widget is not self.text:
+            return
+        self._closed = True
+        self._discard_queue()
+        self._spool.close()
@@ -2,10 +2,8 @@
 
 import tkinter as tk
 from tkinter import ttk
-from ui.actions_tab import ActionsTab
-from ui.logs_tab import LogsTab
-from ui.system_info_tab import SystemInfoTab
 from core.logger import AuditLogger
+from core.startup import STARTUP
 import platform
 
 
@@ -32,6 +30,7 @@ class Dashboard:
         self.master = master
         self.session = session
         self.audit_logger = audit_logger
+        self._tabs = {}
         self._build_interface()
 
     def _build_interface(self):
@@ -88,10 +87,13 @@ class Dashboard:
         self.actions_frame = tk.Frame(self.notebook, bg=LIGHT_MAROON_BG)
         self.logs_frame = tk.Frame(self.notebook, bg=LIGHT_MAROON_BG)
         self.sysinfo_frame = tk.Frame(self.notebook, bg=LIGHT_MAROON_BG)
+        self.fleet_frame = tk.Frame(self.notebook, bg=LIGHT_MAROON_BG)
 
         self.notebook.add(self.actions_frame, text="⚡ Actions")
         self.notebook.add(self.logs_frame, text="📜 Logs")
         self.notebook.add(self.sysinfo_frame, text="💻 System Info")
+        if "fleet" in self.session["permissions"]:
+            self.notebook.add(self.fleet_frame, text="🛰 Fleet")
 
         # ---------------------------------
         # Sidebar Buttons (Styled + Icons)
@@ -123,6 +125,10 @@ class Dashboard:
         btn_actions = sidebar_btn("Actions", "⚡", lambda: self._select_tab(0))
         btn_logs = sidebar_btn("Logs", "📜", lambda: self._select_tab(1))
         btn_sysinfo = sidebar_btn("System Info", "💻", lambda: self._select_tab(2))
+        if "fleet" in self.session["permissions"]:
+            btn_fleet = sidebar_btn("Fleet", "🛰", lambda: self._select_tab(3))
+        if self.session["role"] == "admin":
+            btn_memory = sidebar_btn("Memory", "🧠", self._open_memory)
 
         # -------------------------
         # Logout Button (Bottom)
@@ -144,11 +150,41 @@ class Dashboard:
         btn_logout.pack(fill="x", padx=6, pady=6)
 
         # ---------------------------------
-        # Instantiate Tab Content (same logic)
+        # Tab content is built lazily on first selection, so the dashboard
+        # appears without waiting for log queries or system probes.
         # ---------------------------------
-        ActionsTab(self.actions_frame, self.session, self.audit_logger)
-        LogsTab(self.logs_frame, self.audit_logger)
-        SystemInfoTab(self.sysinfo_frame)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._ensure_tab(0)
+        STARTUP.mark("dashboard built")
+        self.master.after_idle(self._on_first_frame)
+
+    def _on_first_frame(self):
+        STARTUP.mark("first frame (dashboard)")
+        STARTUP.report()
+
+    def _on_tab_changed(self, event=None):
+        self._ensure_tab(self.notebook.index(self.notebook.select()))
+
+    def _ensure_tab(self, index: int):
+        """Construct the tab's content the first time it is shown."""
+        if index in self._tabs:
+            return
+        if index == 0:
+            from ui.actions_tab import ActionsTab
+            self._tabs[index] = ActionsTab(self.actions_frame, self.session, self.audit_logger)
+        elif index == 1:
+            from ui.logs_tab import LogsTab
+            self._tabs[index] = LogsTab(self.logs_frame, self.audit_logger)
+        elif index == 2:
+            from ui.system_info_tab import SystemInfoTab
+            self._tabs[index] = SystemInfoTab(self.sysinfo_frame)
+        elif index == 3:
+            from ui.fleet_tab import FleetTab
+            self._tabs[index] = FleetTab(self.fleet_frame)
+
+    def _open_memory(self):
+        from ui.memory_window import MemoryWindow
+        MemoryWindow(self.master)
 
     def _select_tab(self, index: int):
         self.notebook.select(index)
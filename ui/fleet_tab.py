@@ -0,0 +1,126 @@
+# ui/fleet_tab.py
+
+import json
+import os
+import tkinter as tk
+from tkinter import ttk
+from core.agent import FleetCollector
+from core.memdiag import register_size_probe
+import platform
+
+# -------------------------
+# Global Theme + Font Setup
+# -------------------------
+def _font(size=12, weight="bold"):
+    if platform.system() == "Windows":
+        base = "Segoe UI"
+    else:
+        base = "Arial"
+    return (base, size, weight)
+
+# Theme Colors
+LIGHT_MAROON_BG = "#f3e4e4"
+INPUT_BG = "#fff6f6"
+DARK_MAROON = "#5a1a1a"
+DARK_MAROON_HOVER = "#3d1111"
+TEXT_LIGHT = "#f8eaea"
+TEXT_DARK = "#2a0c0c"
+
+AGENTS_FILE = "data/agents.json"
+COLUMNS = ("agent", "status", "host", "os", "cpu", "memory", "processes", "latency_ms",
+           "last_seen", "error")
+
+
+def load_agent_config(path: str = AGENTS_FILE) -> dict:
+    """{"agents": ["host:port" | "unix:/path", ...], "interval": s, "timeout": s, "token": str}"""
+    if not os.path.exists(path):
+        return {"agents": []}
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+class FleetTab:
+    """Fleet table fed by a background FleetCollector; the Tk thread only reads rows."""
+
+    def __init__(self, master, refresh_ms: int = 1000):
+        self.master = master
+        self.refresh_ms = refresh_ms
+        self.config = load_agent_config()
+        self.collector = None
+        self._build_interface()
+        self._connect()
+        self._render()
+        register_size_probe("ui.fleet_tab processes", lambda tab: sum(
+            len(tab.collector.processes(agent)) for agent in tab.tree.get_children())
+            if tab.collector is not None else 0, owner=self)
+
+    def _build_interface(self):
+        frame = tk.Frame(self.master, bg=LIGHT_MAROON_BG)
+        frame.pack(fill="both", expand=True, padx=12, pady=12)
+        frame.bind("<Destroy>", self._on_destroy, add="+")
+        self.frame = frame
+
+        card = tk.Frame(frame, bg=INPUT_BG, bd=0, padx=14, pady=14)
+        card.pack(fill="both", expand=True)
+
+        title_row = tk.Frame(card, bg=INPUT_BG)
+        title_row.pack(fill="x", pady=(0, 10))
+        tk.Label(title_row, text="Fleet", bg=INPUT_BG, fg=TEXT_DARK, font=_font(16)).pack(side="left", anchor="w")
+
+        self.entry_agents = ttk.Entry(title_row, width=60, font=_font(11, "normal"))
+        self.entry_agents.insert(0, ", ".join(self.config.get("agents", [])))
+        self.entry_agents.pack(side="left", padx=(16, 8), fill="x", expand=True)
+
+        connect_btn = tk.Button(
+            title_row,
+            text="⟳ Connect",
+            font=_font(12),
+            bg=DARK_MAROON,
+            fg=TEXT_LIGHT,
+            activebackground=DARK_MAROON_HOVER,
+            bd=0,
+            pady=6,
+            padx=12,
+            cursor="hand2",
+            command=self._connect
+        )
+        connect_btn.pack(side="right", padx=4)
+        connect_btn.bind("<Enter>", lambda e: connect_btn.configure(bg=DARK_MAROON_HOVER))
+        connect_btn.bind("<Leave>", lambda e: connect_btn.configure(bg=DARK_MAROON))
+
+        self.tree = ttk.Treeview(card, columns=COLUMNS, show="headings", height=16, style="Logs.Treeview")
+        for col in COLUMNS:
+            self.tree.heading(col, text=col.replace("_", " ").title())
+            self.tree.column(col, width=220 if col in ("agent", "error") else 90, anchor="w")
+        self.tree.tag_configure("down", foreground="#a11d1d")
+        self.tree.pack(fill="both", expand=True, pady=(8, 0))
+
+    def _connect(self):
+        """(Re)start polling the agents listed in the entry."""
+        if self.collector is not None:
+            self.collector.stop()
+        agents = list(dict.fromkeys(a.strip() for a in self.entry_agents.get().split(",") if a.strip()))
+        self.collector = FleetCollector(agents,
+                                        interval=self.config.get("interval", 2.0),
+                                        timeout=self.config.get("timeout", 1.5),
+                                        token=self.config.get("token"))
+        self.collector.start()
+        self.tree.delete(*self.tree.get_children())
+        for agent in agents:
+            self.tree.insert("", tk.END, iid=agent, values=(agent, "connecting"))
+
+    def _render(self):
+        if self.collector is None:
+            return
+        for row in self.collector.rows():
+            if self.tree.exists(row["agent"]):
+                self.tree.item(row["agent"], values=tuple(row[col] for col in COLUMNS),
+                               tags=("down",) if row["status"] == "down" else ())
+        self.master.after(self.refresh_ms, self._render)
+
+    def _on_destroy(self, event=None):
+        if event is not None and event.widget is not self.frame:
+            return
+        if self.collector is not None:
+            self.collector.stop()
+            self.collector = None
@@ -3,6 +3,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from ui.dashboard import Dashboard
+from core.startup import STARTUP
 import platform
 
 def _font(size=12, weight="bold"):
@@ -205,8 +206,10 @@ class LoginPage:
         username = self.entry_username.get().strip()
         password = self.entry_password.get().strip()
 
+        STARTUP.mark("login submitted")
         # functionality unchanged
         session = self.security_controller.authenticate(username, password)
+        STARTUP.mark("authenticated")
 
         if session:
             self.audit_logger.record(username, "login", "success")
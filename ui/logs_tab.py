@@ -4,7 +4,10 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from typing import Optional
 from core.logger import AuditLogger
+from core.memdiag import register_size_probe
 import platform
+import threading
+from concurrent.futures import Future
 
 # Theme/font helpers (consistent with other UI files)
 def _font(size=12, weight="bold"):
@@ -28,8 +31,13 @@ class LogsTab:
     def __init__(self, master, audit_logger: AuditLogger):
         self.master = master
         self.audit_logger = audit_logger
+        # columns are loaded once and refreshed incrementally on later runs
+        self._analytics = None
         self._build_interface()
         self._load_logs()
+        register_size_probe("ui.logs_tab rows", lambda tab: len(tab.tree.get_children()), owner=self)
+        register_size_probe("core.analytics rows",
+                            lambda tab: len(tab._analytics) if tab._analytics is not None else 0, owner=self)
 
     def _build_interface(self):
         frame = tk.Frame(self.master, bg=LIGHT_MAROON_BG)
@@ -73,9 +81,10 @@ class LogsTab:
 
         styled_btn(filter_frame, "Refresh", self._load_logs)
         styled_btn(filter_frame, "Export CSV", self._export_csv)
+        self.analyze_btn = styled_btn(filter_frame, "Analyze", self._analyze)
 
         # ---------------- Treeview ----------------
-        columns = ("username", "action", "status", "timestamp")
+        columns = ("username", "action", "status", "timestamp", "args", "size", "count", "first")
         style = ttk.Style()
         try:
             style.theme_use("clam")
@@ -90,8 +99,12 @@ class LogsTab:
         self.tree = ttk.Treeview(card, columns=columns, show="headings", height=16, style="Logs.Treeview")
         for col in columns:
             self.tree.heading(col, text=col.title())
-            if col == "timestamp":
+            if col in ("timestamp", "first"):
                 self.tree.column(col, width=180, anchor="center")
+            elif col == "args":
+                self.tree.column(col, width=280, anchor="w")
+            elif col in ("size", "count"):
+                self.tree.column(col, width=80, anchor="e")
             else:
                 self.tree.column(col, width=140, anchor="w")
 
@@ -117,10 +130,67 @@ class LogsTab:
         }
         filters = {k: v for k, v in filters.items() if v is not None}
 
-        rows = self.audit_logger.fetch_logs(limit=2000, filters=filters)
+        rows = self.audit_logger.fetch_logs(limit=2000, filters=filters, include_context=True)
         for row in rows:
-            # Expecting row to match (username, action, status, timestamp)
-            self.tree.insert("", tk.END, values=row)
+            # (username, action, status, timestamp, args, result_size, count, first_timestamp)
+            values = tuple("" if v is None else v for v in row)
+            self.tree.insert("", tk.END, values=values)
+
+    def _analyze(self):
+        """Run the vectorized analytics off the Tk thread and show the results."""
+        if self._analytics is None:
+            from core.analytics import AuditAnalytics
+            self._analytics = AuditAnalytics(self.audit_logger.db_path)
+        analytics = self._analytics
+        future = Future()
+
+        def work():
+            try:
+                analytics.refresh()
+                future.set_result((analytics.user_summary(), analytics.anomalies()))
+            except Exception as exc:
+                future.set_exception(exc)
+
+        def poll():
+            if not future.done():
+                self.master.after(100, poll)
+                return
+            self.analyze_btn.configure(state="normal", text="Analyze")
+            try:
+                users, anomalies = future.result()
+            except Exception as exc:
+                messagebox.showerror("Analysis Failed", str(exc))
+                return
+            self._show_analysis(users, anomalies)
+
+        self.analyze_btn.configure(state="disabled", text="Analyzing…")
+        threading.Thread(target=work, daemon=True).start()
+        self.master.after(100, poll)
+
+    def _show_analysis(self, users, anomalies):
+        win = tk.Toplevel(self.master)
+        win.title("Audit Analytics")
+        win.configure(bg=INPUT_BG)
+        win.geometry("860x560")
+
+        def table(title, columns, rows, height):
+            tk.Label(win, text=title, bg=INPUT_BG, fg=TEXT_DARK, font=_font(13)).pack(anchor="w", padx=12, pady=(10, 4))
+            tree = ttk.Treeview(win, columns=columns, show="headings", height=height, style="Logs.Treeview")
+            for col in columns:
+                tree.heading(col, text=col.replace("_", " ").title())
+                tree.column(col, width=120, anchor="w")
+            for row in rows:
+                tree.insert("", tk.END, values=tuple(row[col] for col in columns))
+            tree.pack(fill="both", expand=True, padx=12)
+
+        table("Users", ("user", "total", "failures", "failure_ratio", "rate_per_min", "peak_window"),
+              users, 6)
+        if anomalies:
+            table("Anomalies", ("kind", "user", "action", "window_start", "count", "expected", "score"),
+                  anomalies, 10)
+        else:
+            tk.Label(win, text="No anomalies detected.", bg=INPUT_BG, fg="#7a4f4f",
+                     font=_font(11, "normal")).pack(anchor="w", padx=12, pady=10)
 
     def _export_csv(self):
         path = filedialog.asksaveasfilename(
@@ -0,0 +1,97 @@
+# ui/memory_window.py
+
+import json
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+from core.memdiag import MEMORY
+import platform
+
+
+def _font(size=12, weight="bold"):
+    if platform.system() == "Windows":
+        base = "Segoe UI"
+    else:
+        base = "Arial"
+    return (base, size, weight)
+
+
+INPUT_BG = "#fff6f6"
+DARK_MAROON = "#5a1a1a"
+DARK_MAROON_HOVER = "#3d1111"
+TEXT_LIGHT = "#f8eaea"
+TEXT_DARK = "#2a0c0c"
+
+
+class MemoryWindow:
+    """
+    Diagnostics panel: tracemalloc control, top allocating modules, growth
+    since the baseline snapshot, and the sizes of caches and widget contents.
+    """
+
+    def __init__(self, master):
+        self.win = tk.Toplevel(master)
+        self.win.title("Memory Diagnostics")
+        self.win.configure(bg=INPUT_BG)
+        self.win.geometry("860x620")
+        self._build_interface()
+        self._run("report")
+
+    def _build_interface(self):
+        buttons = tk.Frame(self.win, bg=INPUT_BG)
+        buttons.pack(fill="x", padx=12, pady=(12, 6))
+
+        def styled_btn(text, command):
+            btn = tk.Button(buttons, text=text, font=_font(11), bg=DARK_MAROON, fg=TEXT_LIGHT,
+                            activebackground=DARK_MAROON_HOVER, bd=0, padx=10, pady=4,
+                            cursor="hand2", command=command)
+            btn.pack(side="left", padx=4)
+            btn.bind("<Enter>", lambda e: btn.configure(bg=DARK_MAROON_HOVER))
+            btn.bind("<Leave>", lambda e: btn.configure(bg=DARK_MAROON))
+            return btn
+
+        styled_btn("Start Tracing", lambda: self._run("start"))
+        styled_btn("Take Baseline", lambda: self._run("snapshot"))
+        styled_btn("Refresh", lambda: self._run("report"))
+        styled_btn("Stop Tracing", lambda: self._run("stop"))
+        self.status = tk.Label(buttons, text="", bg=INPUT_BG, fg="#7a4f4f", font=_font(10, "normal"))
+        self.status.pack(side="left", padx=12)
+
+        self.modules = self._table("Top modules", ("module", "bytes", "blocks"), 7)
+        self.growth = self._table("Growth since baseline", ("module", "bytes", "bytes_diff", "blocks_diff"), 7)
+
+        tk.Label(self.win, text="Caches and widgets", bg=INPUT_BG, fg=TEXT_DARK,
+                 font=_font(13)).pack(anchor="w", padx=12, pady=(10, 4))
+        self.caches = scrolledtext.ScrolledText(self.win, height=8, font=("Consolas", 10),
+                                                bg="white", relief="flat")
+        self.caches.pack(fill="both", expand=True, padx=12, pady=(0, 12))
+
+    def _table(self, title, columns, height):
+        tk.Label(self.win, text=title, bg=INPUT_BG, fg=TEXT_DARK, font=_font(13)).pack(anchor="w", padx=12, pady=(10, 4))
+        tree = ttk.Treeview(self.win, columns=columns, show="headings", height=height, style="Logs.Treeview")
+        for col in columns:
+            tree.heading(col, text=col.replace("_", " ").title())
+            tree.column(col, width=320 if col == "module" else 120, anchor="w" if col == "module" else "e")
+        tree.pack(fill="x", padx=12)
+        return tree
+
+    def _run(self, command):
+        # runs on the Tk thread: widget size probes must not be read from a worker
+        try:
+            report = MEMORY.command(command)
+        except Exception as exc:
+            self.status.configure(text=str(exc))
+            return
+        if report.get("tracing"):
+            self.status.configure(text=f"traced {report['traced_bytes'] / 1048576:.1f} MiB, "
+                                       f"peak {report['peak_bytes'] / 1048576:.1f} MiB")
+        else:
+            self.status.configure(text="tracing off")
+
+        for tree, key, columns in ((self.modules, "top_modules", ("module", "bytes", "blocks")),
+                                   (self.growth, "growth", ("module", "bytes", "bytes_diff", "blocks_diff"))):
+            tree.delete(*tree.get_children())
+            for row in report.get(key, []):
+                tree.insert("", tk.END, values=tuple(row[col] for col in columns))
+
+        self.caches.delete("1.0", tk.END)
+        self.caches.insert("1.0", json.dumps(report["caches"], indent=2))